@@ -0,0 +1,132 @@
+from settings import *
+import numpy as np
+
+# Battle rules for the batch simulator (simulate.py) and the battle screen.
+# Monsters, abilities and elements are integer ids into tables built once from
+# settings.py, and a BattleState holds any number of battles side by side: the
+# simulator steps millions at once, and Battle wraps a single one with the same
+# step() for the battle screen (main.py does not have one yet).
+
+MOVESET_SIZE = 4
+MAX_TURNS = 200
+
+MONSTER_NAMES = list(MONSTER_DATA)
+ABILITY_NAMES = list(ABILITIES_DATA)
+ELEMENT_NAMES = list(ELEMENT_DATA)
+MONSTER_IDS = {name: index for index, name in enumerate(MONSTER_NAMES)}
+ABILITY_IDS = {name: index for index, name in enumerate(ABILITY_NAMES)}
+ELEMENT_IDS = {name: index for index, name in enumerate(ELEMENT_NAMES)}
+
+MONSTER_HEALTH = np.array([MONSTER_DATA[name]['health'] for name in MONSTER_NAMES], float)
+MONSTER_ELEMENT = np.array([ELEMENT_IDS[MONSTER_DATA[name]['element']] for name in MONSTER_NAMES])
+ABILITY_DAMAGE = np.array([ABILITIES_DATA[name]['damage'] for name in ABILITY_NAMES], float)
+ABILITY_ELEMENT = np.array([ELEMENT_IDS[ABILITIES_DATA[name]['element']] for name in ABILITY_NAMES])
+
+# ELEMENT_MULTIPLIER[attack element, defending element]
+ELEMENT_MULTIPLIER = np.array([[ELEMENT_DATA[attack][defence] for defence in ELEMENT_NAMES] for attack in ELEMENT_NAMES], float)
+
+# DAMAGE_TABLE[ability, target monster]: ability damage x element multiplier
+DAMAGE_TABLE = ABILITY_DAMAGE[:, None] * ELEMENT_MULTIPLIER[ABILITY_ELEMENT][:, MONSTER_ELEMENT]
+
+def damage(ability, target):
+    return DAMAGE_TABLE[ability, target]
+
+def random_movesets(rng, shape, size = MOVESET_SIZE):
+    # distinct abilities per monster, like a moveset drawn with random.sample
+    keys = rng.random((*shape, len(ABILITY_NAMES)))
+    return keys.argsort(axis = -1)[..., :size]
+
+class BattleState:
+    # teams: (battles, team size) monster ids per side
+    # movesets: (battles, team size, moveset size) ability ids per side
+    def __init__(self, team_a, team_b, movesets_a, movesets_b, first = 0):
+        self.monsters = np.stack([team_a, team_b], axis = 1)
+        self.movesets = np.stack([movesets_a, movesets_b], axis = 1)
+        self.health = MONSTER_HEALTH[self.monsters]
+        self.team_size = self.monsters.shape[2]
+
+        battles = len(self.monsters)
+        self.active = np.zeros((battles, 2), int)
+        self.turn = np.broadcast_to(first, battles).astype(int)
+        self.turns = np.zeros(battles, int)
+        # side that won, -1 while the battle is running or when it hit MAX_TURNS
+        self.winner = np.full(battles, -1)
+        self.finished = np.zeros(battles, bool)
+
+    def __len__(self):
+        return len(self.monsters)
+
+def step(state, slots):
+    # the side to move in every running battle uses the ability in moveset slot
+    # `slots`; fainted monsters are replaced by the next in their team and a
+    # side with nobody left loses. Returns the running battles, abilities and damage.
+    live = np.flatnonzero(~state.finished)
+    attacker = state.turn[live]
+    defender = 1 - attacker
+    attacker_index = state.active[live, attacker]
+    defender_index = state.active[live, defender]
+
+    ability = state.movesets[live, attacker, attacker_index, slots[live]]
+    target = state.monsters[live, defender, defender_index]
+    dealt = DAMAGE_TABLE[ability, target]
+
+    health = state.health[live, defender, defender_index] - dealt
+    state.health[live, defender, defender_index] = np.maximum(health, 0)
+    fainted = health <= 0
+    state.active[live[fainted], defender[fainted]] += 1
+
+    lost = fainted & (state.active[live, defender] >= state.team_size)
+    state.winner[live[lost]] = attacker[lost]
+    state.turn[live] = defender
+    state.turns[live] += 1
+    state.finished[live] = lost | (state.turns[live] >= MAX_TURNS)
+    return live, ability, dealt
+
+def run_random(state, rng):
+    # both sides pick a random moveset slot every turn until all battles end
+    moveset_size = state.movesets.shape[3]
+    while not state.finished.all():
+        step(state, rng.integers(0, moveset_size, len(state)))
+    return state.winner
+
+class Battle:
+    # a single interactive battle: the player is side 0, the opponent side 1
+    def __init__(self, player_team, opponent_team, rng = None):
+        if len(player_team) != len(opponent_team):
+            raise ValueError('both teams need the same number of monsters')
+        self.rng = rng or np.random.default_rng()
+        player = np.array([[MONSTER_IDS[name] for name in player_team]])
+        opponent = np.array([[MONSTER_IDS[name] for name in opponent_team]])
+        self.state = BattleState(player, opponent, random_movesets(self.rng, player.shape), random_movesets(self.rng, opponent.shape))
+
+    def abilities(self, side = 0):
+        index = min(self.state.active[0, side], self.state.team_size - 1)
+        return [ABILITY_NAMES[ability] for ability in self.state.movesets[0, side, index]]
+
+    def monster(self, side = 0):
+        index = min(self.state.active[0, side], self.state.team_size - 1)
+        return MONSTER_NAMES[self.state.monsters[0, side, index]], float(self.state.health[0, side, index])
+
+    @property
+    def player_turn(self):
+        return not self.over and self.state.turn[0] == 0
+
+    @property
+    def over(self):
+        return bool(self.state.finished[0])
+
+    @property
+    def winner(self):
+        return int(self.state.winner[0])
+
+    def attack(self, ability_name = None):
+        # the side to move uses ability_name from its own moveset, or a random
+        # one when it is None
+        if self.over:
+            raise RuntimeError('the battle is over')
+        if ability_name is None:
+            slot = self.rng.integers(0, self.state.movesets.shape[3])
+        else:
+            slot = self.abilities(int(self.state.turn[0])).index(ability_name)
+        _, ability, dealt = step(self.state, np.array([slot]))
+        return ABILITY_NAMES[ability[0]], float(dealt[0])
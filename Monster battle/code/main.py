@@ -1,6 +1,11 @@
 from settings import *
 from support import *
 from timer import Timer
+from common.dirty import DirtyRenderer
+from common.gameloop import FixedTimestep, InterpolatedGroup
+from common.profiler import profiler
+from common.scheduler import scheduler
+import logging
 
 class Game:
     def __init__(self):
@@ -9,26 +14,56 @@ class Game:
         pygame.display.set_caption('Monster Battle')
         self.clock = pygame.time.Clock()
         self.running = True
+        self.loop = FixedTimestep(SIMULATION_STEP, MAX_CATCH_UP_STEPS)
+        self.import_assets()
 
         # groups 
-        self.all_sprites = pygame.sprite.Group()
+        self.all_sprites = InterpolatedGroup()
+
+        # the battle background is static, only sprites are redrawn
+        self.renderer = DirtyRenderer(self.display_surface, self.bg_surfs['bg'], DIRTY_RECTS)
+
+    def import_assets(self):
+        start = perf_counter()
+        self.front_surfs = atlas_importer('..', 'images', 'front')
+        self.back_surfs = atlas_importer('..', 'images', 'back')
+        self.bg_surfs = folder_importer('..', 'images', 'other')
+        self.attack_frames = folder_importer('..', 'images', 'attacks')
+        self.simple_surfs = folder_importer('..', 'images', 'simple', lazy = True)
+        self.audio = audio_importer('..', 'audio')
+        logging.debug(import_report(perf_counter() - start))
 
     def run(self):
         while self.running:
-            dt = self.clock.tick() / 1000
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
+            with profiler.span('events'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                        self.renderer.toggle()
+                    profiler.handle_event(event)
            
             # update
-            self.all_sprites.update(dt)
+            for _ in self.loop.tick(self.clock):
+                with profiler.span('update'):
+                    scheduler.update(self.loop.step * 1000)
+                    self.all_sprites.snapshot()
+                    self.all_sprites.update(self.loop.step)
 
             # draw  
-            self.all_sprites.draw(self.display_surface)
-            pygame.display.update()
+            with profiler.span('draw'):
+                self.renderer.clear()
+                self.renderer.draw(self.all_sprites, self.loop.alpha)
+                self.renderer.mark(profiler.draw(self.display_surface))
+            with profiler.span('display'):
+                self.renderer.update()
+            profiler.end_frame()
         
         pygame.quit()
+        logging.debug(self.renderer)
     
 if __name__ == '__main__':
+    if '--debug' in sys.argv:
+        logging.basicConfig(level = logging.DEBUG)
     game = Game()
     game.run()
\ No newline at end of file
@@ -1,8 +1,14 @@
 import pygame
-from os.path import join 
+import sys
+from os.path import join, abspath, dirname
 from os import walk
 
+sys.path.append(join(dirname(abspath(__file__)), '..', '..'))
+
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280,720 
+SIMULATION_STEP = 1 / 60 # seconds per fixed update step
+MAX_CATCH_UP_STEPS = 5
+DIRTY_RECTS = True # F2 switches between dirty rects and full redraws
 
 COLORS = {
     'black': '#000000',
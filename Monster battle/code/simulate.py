@@ -0,0 +1,121 @@
+from battle import *
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+# Headless balance testing. Runs random battles with the game's own rules
+# (battle.step) spread over a process pool and prints win-rate matrices:
+#
+#   python simulate.py --battles 1000000
+#   python simulate.py --mode team --team-size 3 --output results.json
+#
+# monster: 1v1 with random movesets, rate[i, j] = monster i beating monster j
+# ability: 1v1 where each side only knows one ability, random monsters
+# team:    random teams, overall win rate of teams containing each monster
+
+CHUNK_BATTLES = 200_000
+
+def matchup_battles(count, battles):
+    # the same number of battles for every (row, column) pairing
+    pairs = np.repeat(np.arange(count * count), max(1, battles // (count * count)))
+    return pairs, *np.divmod(pairs, count)
+
+def monster_chunk(seed, battles):
+    rng = np.random.default_rng(seed)
+    count = len(MONSTER_NAMES)
+    pairs, row, column = matchup_battles(count, battles)
+    state = BattleState(row[:, None], column[:, None],
+                        random_movesets(rng, (len(pairs), 1)), random_movesets(rng, (len(pairs), 1)),
+                        first = rng.integers(0, 2, len(pairs)))
+    winner = run_random(state, rng)
+    wins = np.bincount(pairs[winner == 0], minlength = count * count)
+    games = np.bincount(pairs, minlength = count * count)
+    return wins.reshape(count, count), games.reshape(count, count)
+
+def ability_chunk(seed, battles):
+    rng = np.random.default_rng(seed)
+    count = len(ABILITY_NAMES)
+    pairs, row, column = matchup_battles(count, battles)
+    monsters = rng.integers(0, len(MONSTER_NAMES), (len(pairs), 2))
+    state = BattleState(monsters[:, :1], monsters[:, 1:],
+                        row[:, None, None], column[:, None, None],
+                        first = rng.integers(0, 2, len(pairs)))
+    winner = run_random(state, rng)
+    wins = np.bincount(pairs[winner == 0], minlength = count * count)
+    games = np.bincount(pairs, minlength = count * count)
+    return wins.reshape(count, count), games.reshape(count, count)
+
+def team_chunk(seed, battles, team_size):
+    rng = np.random.default_rng(seed)
+    count = len(MONSTER_NAMES)
+    # distinct monsters per team
+    teams = rng.random((battles, 2, count)).argsort(axis = -1)[..., :team_size]
+    state = BattleState(teams[:, 0], teams[:, 1],
+                        random_movesets(rng, (battles, team_size)), random_movesets(rng, (battles, team_size)),
+                        first = rng.integers(0, 2, battles))
+    winner = run_random(state, rng)
+    won = np.stack([winner == 0, winner == 1], axis = 1)[:, :, None]
+    wins = np.bincount(teams[np.broadcast_to(won, teams.shape)], minlength = count)
+    games = np.bincount(teams.ravel(), minlength = count)
+    return wins, games
+
+def run_chunk(job):
+    mode, seed, battles, team_size = job
+    if mode == 'monster':
+        return monster_chunk(seed, battles)
+    if mode == 'ability':
+        return ability_chunk(seed, battles)
+    return team_chunk(seed, battles, team_size)
+
+def simulate(mode = 'monster', battles = 1_000_000, team_size = 3, seed = 0, workers = None):
+    chunks = max(1, -(-battles // CHUNK_BATTLES))
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+    jobs = [(mode, chunk_seed, -(-battles // chunks), team_size) for chunk_seed in seeds]
+    with ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(run_chunk, jobs))
+    wins = sum(result[0] for result in results)
+    games = sum(result[1] for result in results)
+    # team battles count once for every monster on either side
+    total = games.sum() // (2 * team_size) if mode == 'team' else games.sum()
+    return wins / np.maximum(games, 1), int(total)
+
+def format_matrix(rates, names):
+    width = max(len(name) for name in names) + 1
+    lines = [' ' * width + ''.join(f'{name[:6]:>7}' for name in names)]
+    for name, row in zip(names, rates):
+        lines.append(f'{name:<{width}}' + ''.join(f'{rate:>7.2f}' for rate in row))
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description = 'batch battle simulator')
+    parser.add_argument('--mode', choices = ('monster', 'ability', 'team'), default = 'monster')
+    parser.add_argument('--battles', type = int, default = 1_000_000)
+    parser.add_argument('--team-size', type = int, default = 3)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--workers', type = int, default = os.cpu_count())
+    parser.add_argument('--output', help = 'write the win rates to this json file')
+    args = parser.parse_args()
+
+    start = perf_counter()
+    rates, battles = simulate(args.mode, args.battles, args.team_size, args.seed, args.workers)
+    elapsed = perf_counter() - start
+
+    names = ABILITY_NAMES if args.mode == 'ability' else MONSTER_NAMES
+    if args.mode == 'team':
+        for name, rate in sorted(zip(names, rates), key = lambda item: -item[1]):
+            print(f'{name:<12} {rate:.3f}')
+    else:
+        print(format_matrix(rates, names))
+        print()
+        for name, rate in sorted(zip(names, rates.mean(axis = 1)), key = lambda item: -item[1]):
+            print(f'{name:<12} {rate:.3f}')
+    print(f'{battles} battles in {elapsed:.2f} s')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'mode': args.mode, 'names': names, 'win_rates': rates.tolist()}, file, indent = 1)
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,108 @@
-from settings import * 
+from settings import *
+from common.atlas import load_atlas
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 
-def folder_importer(*path):
-    surfs = {}
-    for folder_path, _, file_names in walk(join(*path)):
-        for file_name in file_names:
-            full_path = join(folder_path, file_name)
-            surfs[file_name.split('.')[0]] = pygame.image.load(full_path).convert_alpha()
-    return surfs
+# seconds spent decoding each file, filled in by the importers
+load_times = {}
 
-def audio_importer(*path):
-    audio_dict = {}
+def file_paths(*path):
+    paths = {}
     for folder_path, _, file_names in walk(join(*path)):
         for file_name in file_names:
-            audio_dict[file_name.split('.')[0]] = pygame.mixer.Sound(join(folder_path, file_name))
-    return audio_dict
\ No newline at end of file
+            paths[file_name.split('.')[0]] = join(folder_path, file_name)
+    return paths
+
+def timed_load(loader, full_path):
+    start = perf_counter()
+    result = loader(full_path)
+    load_times[full_path] = perf_counter() - start
+    return result
+
+def decode_image(full_path):
+    # runs on worker threads: SDL_image releases the GIL while decoding
+    return timed_load(pygame.image.load, full_path)
+
+class LazyAssets(Mapping):
+    # loads each file the first time its key is looked up
+    def __init__(self, paths, loader):
+        self.paths = paths
+        self.loader = loader
+        self.loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self.loaded:
+            self.loaded[name] = self.loader(self.paths[name])
+        return self.loaded[name]
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+def load_surfaces(paths, workers = None):
+    with ThreadPoolExecutor(workers) as executor:
+        surfs = dict(zip(paths, executor.map(decode_image, paths.values())))
+    # convert_alpha needs the display, so it stays on the main thread
+    return {name: surf.convert_alpha() for name, surf in surfs.items()}
+
+def folder_importer(*path, lazy = False, workers = None):
+    paths = file_paths(*path)
+    if lazy:
+        return LazyAssets(paths, lambda full_path: decode_image(full_path).convert_alpha())
+    return load_surfaces(paths, workers)
+
+def atlas_importer(*path, workers = None):
+    # same keys as folder_importer, but every surface is a subsurface of one
+    # atlas texture; without a built atlas the folder is decoded on threads and
+    # packed in memory
+    atlas = load_atlas(join(*path), loader = lambda paths: load_surfaces(paths, workers))
+    return {name.split('/')[-1]: atlas[name] for name in atlas.keys()}
+
+class MusicTrack:
+    # Sound-like handle that streams through pygame.mixer.music instead of
+    # decoding the whole file into memory
+    def __init__(self, full_path):
+        self.full_path = full_path
+        self.volume = 1
+
+    def play(self, loops = 0, maxtime = 0, fade_ms = 0):
+        pygame.mixer.music.load(self.full_path)
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops, fade_ms = fade_ms)
+
+    def stop(self):
+        pygame.mixer.music.stop()
+
+    def fadeout(self, time):
+        pygame.mixer.music.fadeout(time)
+
+    def set_volume(self, value):
+        self.volume = value
+        pygame.mixer.music.set_volume(value)
+
+    def get_volume(self):
+        return self.volume
+
+def audio_importer(*path, stream = ('music',), lazy = False, workers = None):
+    paths = file_paths(*path)
+    stream_paths = {paths[name] for name in stream if name in paths}
+
+    def load_audio(full_path):
+        if full_path in stream_paths:
+            return MusicTrack(full_path)
+        return timed_load(pygame.mixer.Sound, full_path)
+
+    if lazy:
+        return LazyAssets(paths, load_audio)
+
+    with ThreadPoolExecutor(workers) as executor:
+        return dict(zip(paths, executor.map(load_audio, paths.values())))
+
+def import_report(total_time = None):
+    lines = [f'{load_times[full_path] * 1000:8.2f} ms  {full_path}' for full_path in sorted(load_times, key = load_times.get, reverse = True)]
+    if total_time is not None:
+        lines.append(f'{total_time * 1000:8.2f} ms  total startup ({len(load_times)} files decoded)')
+    return '\n'.join(lines)
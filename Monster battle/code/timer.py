@@ -1,12 +1,17 @@
 from settings import *
+from common.scheduler import scheduler as default_scheduler
 
 class Timer:
-	def __init__(self, duration, repeat = False, autostart = False, func = None):
+	# thin wrapper over the shared heap scheduler: the timer no longer polls,
+	# its callback fires when the scheduler reaches the deadline
+	def __init__(self, duration, repeat = False, autostart = False, func = None, scheduler = None):
 		self.duration = duration
 		self.start_time = 0
 		self.active = False
 		self.repeat = repeat
 		self.func = func
+		self.scheduler = scheduler or default_scheduler
+		self.call = None
 		
 		if autostart:
 			self.activate()
@@ -16,16 +21,25 @@ class Timer:
 
 	def activate(self):
 		self.active = True
-		self.start_time = pygame.time.get_ticks()
+		self.start_time = self.scheduler.now
+		if self.call:
+			self.call.cancel()
+		self.call = self.scheduler.schedule(self.duration, self.expire)
 
 	def deactivate(self):
 		self.active = False
 		self.start_time = 0
+		if self.call:
+			self.call.cancel()
+			self.call = None
 		if self.repeat:
 			self.activate()
 
+	def expire(self):
+		self.call = None
+		if self.func: self.func()
+		self.deactivate()
+
 	def update(self):
-		if self.active:
-			if pygame.time.get_ticks() - self.start_time >= self.duration:
-				if self.func and self.start_time != 0: self.func()
-				self.deactivate()
\ No newline at end of file
+		# kept for existing callers, the scheduler is advanced once per step by the game
+		pass
\ No newline at end of file
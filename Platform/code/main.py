@@ -1,4 +1,9 @@
 from settings import * 
+from tilemap import TileMap
+from common.collision_index import CollisionIndex
+from common.compiled_map import load_map
+from common.gameloop import FixedTimestep, InterpolatedGroup
+from common.profiler import profiler
 
 class Game:
     def __init__(self):
@@ -7,27 +12,44 @@ class Game:
         pygame.display.set_caption('Platformer')
         self.clock = pygame.time.Clock()
         self.running = True
+        self.loop = FixedTimestep(SIMULATION_STEP, MAX_CATCH_UP_STEPS)
 
         # groups 
-        self.all_sprites = pygame.sprite.Group()
+        self.all_sprites = InterpolatedGroup()
         self.collision_sprites = pygame.sprite.Group()
 
+        self.setup()
+
+    def setup(self):
+        tmx_map = load_map(join('..', 'data', 'maps', 'world.tmx'))
+        self.tile_map = TileMap(tmx_map, ('Main', 'Decoration'))
+        self.collision_index = CollisionIndex.from_tmx(tmx_map, tile_layers = ('Main',))
+        self.camera_offset = pygame.Vector2()
 
     def run(self):
         while self.running:
-            dt = self.clock.tick(FRAMERATE) / 1000 
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False 
+            with profiler.span('events'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False 
+                    profiler.handle_event(event)
             
             # update
-            self.all_sprites.update(dt)
+            for _ in self.loop.tick(self.clock, FRAMERATE):
+                with profiler.span('update'):
+                    self.all_sprites.snapshot()
+                    self.all_sprites.update(self.loop.step)
 
             # draw 
-            self.display_surface.fill(BG_COLOR)
-            self.all_sprites.draw(self.display_surface)
-            pygame.display.update()
+            with profiler.span('draw'):
+                self.display_surface.fill(BG_COLOR)
+                with profiler.span('tiles'):
+                    self.tile_map.draw(self.display_surface, self.camera_offset)
+                self.all_sprites.draw(self.display_surface, self.loop.alpha)
+                profiler.draw(self.display_surface)
+            with profiler.span('display'):
+                pygame.display.update()
+            profiler.end_frame()
         
         pygame.quit()
 
@@ -1,9 +1,15 @@
 import pygame
+import sys
 from os import walk
-from os.path import join
+from os.path import join, abspath, dirname
 from pytmx.util_pygame import load_pygame
 
+sys.path.append(join(dirname(abspath(__file__)), '..', '..'))
+
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280,720
 TILE_SIZE = 64 
+CHUNK_SIZE = 8 # tiles per side of a pre-rendered map chunk
 FRAMERATE = 60
+SIMULATION_STEP = 1 / 60 # seconds per fixed update step
+MAX_CATCH_UP_STEPS = 5
 BG_COLOR = '#fcdfcd'
@@ -0,0 +1,86 @@
+from settings import *
+
+class TileMap:
+    # Static tile layers baked into fixed-size chunk surfaces. Drawing blits
+    # only the chunks the camera can see; changing a tile re-bakes its chunk.
+    def __init__(self, tmx_map, layer_names, chunk_size = CHUNK_SIZE):
+        self.tile_size = tmx_map.tilewidth
+        self.width, self.height = tmx_map.width, tmx_map.height
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * self.tile_size
+        self.layer_names = list(layer_names)
+
+        # layer name -> {(x, y): surf}, in draw order
+        self.layers = {name: {} for name in self.layer_names}
+        for name in self.layer_names:
+            for x, y, surf in tmx_map.get_layer_by_name(name).tiles():
+                self.layers[name][(x, y)] = surf
+
+        self.columns = -(-self.width // chunk_size)
+        self.rows = -(-self.height // chunk_size)
+        self.chunks = {}
+        self.dirty = set()
+        self.rebuilds = 0
+        for chunk in self.all_chunks():
+            self.bake(chunk)
+
+    def all_chunks(self):
+        return ((column, row) for column in range(self.columns) for row in range(self.rows))
+
+    def chunk_of(self, x, y):
+        return x // self.chunk_size, y // self.chunk_size
+
+    def bake(self, chunk):
+        column, row = chunk
+        left, top = column * self.chunk_size, row * self.chunk_size
+        width = min(self.chunk_size, self.width - left) * self.tile_size
+        height = min(self.chunk_size, self.height - top) * self.tile_size
+
+        blits = []
+        for name in self.layer_names:
+            tiles = self.layers[name]
+            for y in range(top, top + self.chunk_size):
+                for x in range(left, left + self.chunk_size):
+                    surf = tiles.get((x, y))
+                    if surf:
+                        blits.append((surf, ((x - left) * self.tile_size, (y - top) * self.tile_size)))
+
+        # empty chunks are skipped at draw time
+        if blits:
+            surf = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+            surf.fblits(blits)
+            self.chunks[chunk] = surf
+        else:
+            self.chunks.pop(chunk, None)
+        self.dirty.discard(chunk)
+        self.rebuilds += 1
+
+    def get_tile(self, layer_name, x, y):
+        return self.layers[layer_name].get((x, y))
+
+    def set_tile(self, layer_name, x, y, surf):
+        tiles = self.layers[layer_name]
+        if surf:
+            tiles[(x, y)] = surf
+        else:
+            tiles.pop((x, y), None)
+        self.dirty.add(self.chunk_of(x, y))
+
+    def visible_chunks(self, surface, offset):
+        # offset is added to world positions, like a camera offset
+        left = max(0, int(-offset[0] // self.chunk_pixels))
+        top = max(0, int(-offset[1] // self.chunk_pixels))
+        right = min(self.columns - 1, int((surface.get_width() - offset[0]) // self.chunk_pixels))
+        bottom = min(self.rows - 1, int((surface.get_height() - offset[1]) // self.chunk_pixels))
+        return ((column, row) for row in range(top, bottom + 1) for column in range(left, right + 1))
+
+    def draw(self, surface, offset = (0, 0)):
+        blits = []
+        for chunk in self.visible_chunks(surface, offset):
+            if chunk in self.dirty:
+                self.bake(chunk)
+            surf = self.chunks.get(chunk)
+            if surf:
+                column, row = chunk
+                blits.append((surf, (column * self.chunk_pixels + offset[0], row * self.chunk_pixels + offset[1])))
+        surface.fblits(blits)
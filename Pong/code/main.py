@@ -1 +1,89 @@
 from settings import * 
+from sprites import *
+from physics import step_ball
+from common.dirty import DirtyRenderer
+from common.gameloop import FixedTimestep, InterpolatedGroup
+from common.profiler import profiler
+from common.text import TextCache
+
+class Game:
+    def __init__(self):
+        pygame.init()
+        self.display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption('Pong')
+        self.clock = pygame.time.Clock()
+        self.running = True
+        self.loop = FixedTimestep(SIMULATION_STEP, MAX_CATCH_UP_STEPS)
+
+        # sprites 
+        self.all_sprites = InterpolatedGroup()
+        self.player = Player(self.all_sprites)
+        self.opponent = Opponent(self.all_sprites)
+        self.ball = Ball(self.all_sprites)
+        self.paddles = (self.player.body, self.opponent.body)
+        self.opponent.retarget(self.ball.body)
+
+        # score
+        self.score = {'player': 0, 'opponent': 0}
+        self.font = pygame.font.Font(None, 160)
+        self.text_cache = TextCache()
+
+        # the court is a flat colour, only moving things are redrawn
+        background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        background.fill(COLORS['bg'])
+        self.renderer = DirtyRenderer(self.display_surface, background)
+
+    def update(self, dt):
+        self.player.input()
+        self.opponent.steer(dt)
+        hits = step_ball(self.ball.body, self.paddles, dt, 0, WINDOW_HEIGHT)
+        self.player.move(dt)
+        self.opponent.move(dt)
+        if hits:
+            self.opponent.retarget(self.ball.body)
+
+        scorer = self.ball.out
+        if scorer:
+            self.score[scorer] += 1
+            self.ball.serve()
+            self.opponent.retarget(self.ball.body)
+        self.all_sprites.update(dt)
+
+    def display_score(self):
+        text = f"{self.score['opponent']}   {self.score['player']}"
+        text_surf = self.text_cache.render(self.font, text, True, COLORS['paddle shadow'])
+        text_rect = text_surf.get_frect(midtop = (WINDOW_WIDTH / 2, 60))
+        return self.display_surface.blit(text_surf, text_rect)
+
+    def run(self):
+        while self.running:
+            with profiler.span('events'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                        self.renderer.toggle()
+                    profiler.handle_event(event)
+
+            # update
+            for _ in self.loop.tick(self.clock):
+                with profiler.span('update'):
+                    self.all_sprites.snapshot()
+                    self.update(self.loop.step)
+
+            # draw 
+            with profiler.span('draw'):
+                self.renderer.clear()
+                self.renderer.mark(self.display_score())
+                self.renderer.draw(self.all_sprites, self.loop.alpha)
+                self.renderer.mark(profiler.draw(self.display_surface))
+                self.text_cache.end_frame()
+            with profiler.span('display'):
+                self.renderer.update()
+            profiler.end_frame()
+
+        pygame.quit()
+
+if __name__ == '__main__':
+    game = Game()
+    game.run()
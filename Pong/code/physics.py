@@ -0,0 +1,139 @@
+from math import inf
+
+# Continuous ball physics. Every step the ball is swept against the walls and
+# the (moving) paddles and advanced to the exact time of the earliest impact,
+# reflected, and swept again with the time that is left, so it cannot tunnel
+# through a paddle at any speed or dt. Plain float state keeps it usable
+# headless; the sprites in sprites.py copy it into their rects.
+
+MAX_BOUNCES = 32
+
+class Body:
+    __slots__ = ('x', 'y', 'w', 'h', 'vx', 'vy')
+
+    def __init__(self, x, y, w, h, vx = 0.0, vy = 0.0):
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.vx, self.vy = vx, vy
+
+    @property
+    def center(self):
+        return self.x + self.w / 2, self.y + self.h / 2
+
+    @center.setter
+    def center(self, pos):
+        self.x, self.y = pos[0] - self.w / 2, pos[1] - self.h / 2
+
+def sweep(x, y, w, h, dx, dy, tx, ty, tw, th):
+    # earliest fraction of the move (dx, dy) at which box (x, y, w, h) touches
+    # target box (tx, ty, tw, th), with the target's face normal, or None
+    if dx > 0:
+        entry_x, exit_x = (tx - (x + w)) / dx, (tx + tw - x) / dx
+    elif dx < 0:
+        entry_x, exit_x = (tx + tw - x) / dx, (tx - (x + w)) / dx
+    elif x + w <= tx or x >= tx + tw:
+        return None
+    else:
+        entry_x, exit_x = -inf, inf
+
+    if dy > 0:
+        entry_y, exit_y = (ty - (y + h)) / dy, (ty + th - y) / dy
+    elif dy < 0:
+        entry_y, exit_y = (ty + th - y) / dy, (ty - (y + h)) / dy
+    elif y + h <= ty or y >= ty + th:
+        return None
+    else:
+        entry_y, exit_y = -inf, inf
+
+    entry = max(entry_x, entry_y)
+    if entry >= min(exit_x, exit_y) or entry < 0 or entry > 1:
+        return None
+    if entry_x > entry_y:
+        return entry, (-1 if dx > 0 else 1), 0
+    return entry, 0, (-1 if dy > 0 else 1)
+
+def step_ball(ball, paddles, dt, top, bottom):
+    # moves the ball by dt against walls at `top`/`bottom` and paddles that
+    # move with their own vy over the same dt (move them afterwards).
+    # Returns the list of surfaces hit: 'wall' or the paddle bodies.
+    hits = []
+    elapsed = 0.0
+    # paddles stop at the walls, so sweep against the velocity they can keep
+    velocities = [min(max(paddle.vy, (top - paddle.y) / dt), (bottom - paddle.h - paddle.y) / dt)
+                  for paddle in paddles] if dt > 0 else []
+    for _ in range(MAX_BOUNCES):
+        remaining = dt - elapsed
+        if remaining <= 0:
+            break
+        dx, dy = ball.vx * remaining, ball.vy * remaining
+        first, normal, surface = 1.0, None, None
+
+        if dy < 0:
+            t = (top - ball.y) / dy
+        elif dy > 0:
+            t = (bottom - ball.y - ball.h) / dy
+        else:
+            t = inf
+        if 0 <= t < first:
+            first, normal, surface = t, (0, 1 if dy < 0 else -1), 'wall'
+
+        for paddle, vy in zip(paddles, velocities):
+            # paddle position at the current time, motion relative to it
+            paddle_y = paddle.y + vy * elapsed
+            result = sweep(ball.x, ball.y, ball.w, ball.h, dx, dy - vy * remaining,
+                           paddle.x, paddle_y, paddle.w, paddle.h)
+            if result and result[0] < first:
+                first, normal, surface, surface_vy = result[0], result[1:], paddle, vy
+
+        ball.x += dx * first
+        ball.y += dy * first
+        if surface is None:
+            break
+
+        elapsed += remaining * first
+        hits.append(surface)
+        if normal[0]:
+            ball.vx = -ball.vx
+        elif surface == 'wall':
+            ball.vy = -ball.vy
+        else:
+            # hit by the top or bottom of a moving paddle: reflect in its frame
+            ball.vy = 2 * surface_vy - ball.vy
+            end_y = surface.y + surface_vy * dt
+            gap = end_y - top if normal[1] < 0 else bottom - end_y - surface.h
+            if gap < ball.h:
+                # no room left between the paddle end and the wall: the ball
+                # is squeezed out sideways instead of being crushed
+                squeeze(ball, surface)
+    else:
+        # still rattling between a paddle end and a wall after MAX_BOUNCES
+        trapped = [surface for surface in hits if surface != 'wall']
+        if trapped:
+            squeeze(ball, trapped[-1])
+    return hits
+
+def squeeze(ball, paddle):
+    # moves the ball clear of the paddle's side it is nearest to, heading away
+    if ball.x + ball.w / 2 < paddle.x + paddle.w / 2:
+        ball.x, ball.vx = paddle.x - ball.w, -abs(ball.vx)
+    else:
+        ball.x, ball.vx = paddle.x + paddle.w, abs(ball.vx)
+
+def predict_intercept(ball, face_x, top, bottom):
+    # centre y of the ball when its leading edge reaches x = face_x, folding
+    # the straight-line path back into the court at every wall bounce
+    if ball.vx > 0:
+        t = (face_x - ball.x - ball.w) / ball.vx
+    elif ball.vx < 0:
+        t = (face_x - ball.x) / ball.vx
+    else:
+        return None
+    if t < 0:
+        return None
+
+    span = bottom - top - ball.h
+    if span <= 0:
+        return top + (bottom - top) / 2
+    offset = (ball.y + ball.vy * t - top) % (2 * span)
+    if offset > span:
+        offset = 2 * span - offset
+    return top + offset + ball.h / 2
@@ -1,10 +1,15 @@
 import pygame
-from os.path import join
+import sys
+from os.path import join, abspath, dirname
+
+sys.path.append(join(dirname(abspath(__file__)), '..', '..'))
 
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280, 720 
 SIZE = {'paddle': (40,100), 'ball': (30,30)}
 POS = {'player': (WINDOW_WIDTH - 50, WINDOW_HEIGHT / 2), 'opponent': (50, WINDOW_HEIGHT / 2)}
 SPEED = {'player': 500, 'opponent': 250, 'ball': 450}
+SIMULATION_STEP = 1 / 120 # seconds per fixed update step
+MAX_CATCH_UP_STEPS = 8
 COLORS = {
     'paddle': '#ee322c',
     'paddle shadow': '#b12521',
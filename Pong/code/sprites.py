@@ -0,0 +1,81 @@
+from settings import *
+from physics import Body, predict_intercept
+from random import choice, uniform
+from math import cos, sin, radians
+
+SHADOW_OFFSET = 6
+
+def shaded_surface(size, color, shadow_color, radius):
+    # shape with its drop shadow baked in, the body is the top-left `size`
+    surf = pygame.Surface((size[0] + SHADOW_OFFSET, size[1] + SHADOW_OFFSET), pygame.SRCALPHA)
+    pygame.draw.rect(surf, shadow_color, pygame.FRect((SHADOW_OFFSET, SHADOW_OFFSET), size), 0, radius)
+    pygame.draw.rect(surf, color, pygame.FRect((0, 0), size), 0, radius)
+    return surf
+
+class Paddle(pygame.sprite.Sprite):
+    def __init__(self, pos, speed, groups):
+        super().__init__()
+        self.body = Body(0, 0, *SIZE['paddle'])
+        self.body.center = pos
+        self.speed = speed
+        self.image = shaded_surface(SIZE['paddle'], COLORS['paddle'], COLORS['paddle shadow'], 20)
+        self.rect = self.image.get_frect(topleft = (self.body.x, self.body.y))
+        self.add(groups)
+
+    def move(self, dt):
+        body = self.body
+        body.y = min(max(body.y + body.vy * dt, 0), WINDOW_HEIGHT - body.h)
+
+    def update(self, dt):
+        self.rect.topleft = (self.body.x, self.body.y)
+
+class Player(Paddle):
+    def __init__(self, groups):
+        super().__init__(POS['player'], SPEED['player'], groups)
+
+    def input(self):
+        keys = pygame.key.get_pressed()
+        self.body.vy = (int(keys[pygame.K_DOWN]) - int(keys[pygame.K_UP])) * self.speed
+
+class Opponent(Paddle):
+    # predicts where the ball will cross its face once per bounce instead of
+    # chasing the ball every frame
+    def __init__(self, groups):
+        super().__init__(POS['opponent'], SPEED['opponent'], groups)
+        self.target_y = WINDOW_HEIGHT / 2
+
+    def retarget(self, ball):
+        target = predict_intercept(ball, self.body.x + self.body.w, 0, WINDOW_HEIGHT)
+        self.target_y = WINDOW_HEIGHT / 2 if target is None else target
+
+    def steer(self, dt):
+        distance = self.target_y - self.body.center[1]
+        self.body.vy = max(-self.speed, min(self.speed, distance / dt))
+
+class Ball(pygame.sprite.Sprite):
+    def __init__(self, groups):
+        super().__init__()
+        self.body = Body(0, 0, *SIZE['ball'])
+        self.image = shaded_surface(SIZE['ball'], COLORS['ball'], COLORS['ball shadow'], SIZE['ball'][0] // 2)
+        self.rect = self.image.get_frect()
+        self.serve()
+        self.add(groups)
+
+    def serve(self):
+        self.body.center = (WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2)
+        angle = radians(uniform(-45, 45))
+        self.body.vx = cos(angle) * SPEED['ball'] * choice((-1, 1))
+        self.body.vy = sin(angle) * SPEED['ball']
+        self.rect.topleft = (self.body.x, self.body.y)
+
+    @property
+    def out(self):
+        # side that scores, or None while the ball is in the court
+        if self.body.x + self.body.w < 0:
+            return 'player'
+        if self.body.x > WINDOW_WIDTH:
+            return 'opponent'
+        return None
+
+    def update(self, dt):
+        self.rect.topleft = (self.body.x, self.body.y)
@@ -0,0 +1,138 @@
+from settings import *
+import numpy as np
+
+class EnemySwarm:
+    # Every enemy is a row in flat NumPy arrays. Steering (seek the player),
+    # separation from neighbours and world collision run as batched array
+    # operations, so the cost per enemy is a few vector ops, not a Python call.
+    def __init__(self, frames, world_grid, speeds, capacity = 1024, cell_size = SWARM_CELL_SIZE, separation = 0.6, seed = None):
+        # frames: kind -> list of surfaces, speeds: kind -> pixels per second
+        self.kinds = list(frames)
+        self.frames = [frames[kind] for kind in self.kinds]
+        self.half_sizes = np.array([[surf.get_width() / 2, surf.get_height() / 2] for surf in (frames[kind][0] for kind in self.kinds)], np.float32)
+        self.kind_speeds = np.array([speeds[kind] for kind in self.kinds], np.float32)
+        self.animation_speed = 6
+        self.separation = separation
+        self.rng = np.random.default_rng(seed)
+
+        # world
+        self.solid = world_grid.solid
+        self.tile_size = world_grid.tile_size
+        self.world_size = np.array([world_grid.width * world_grid.tile_size, world_grid.height * world_grid.tile_size], np.float32)
+        self.cell_size = cell_size
+        self.grid_width = int(-(-self.world_size[0] // cell_size))
+        self.grid_height = int(-(-self.world_size[1] // cell_size))
+
+        # enemy state
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.kind = np.zeros(capacity, np.uint8)
+        self.frame = np.zeros(capacity, np.float32)
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, needed):
+        capacity = len(self.pos)
+        while capacity < needed:
+            capacity *= 2
+        for name in ('pos', 'vel', 'kind', 'frame'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, pos, kind, amount = 1, spread = 16):
+        if self.count + amount > len(self.pos):
+            self.grow(self.count + amount)
+        new = slice(self.count, self.count + amount)
+        # a little jitter so enemies from the same spawn point can separate,
+        # kept inside the world like every move in update()
+        jittered = np.asarray(pos, np.float32) + self.rng.uniform(-spread, spread, (amount, 2))
+        self.pos[new] = np.clip(jittered, 0, self.world_size - 1)
+        self.vel[new] = 0
+        self.kind[new] = self.kinds.index(kind) if isinstance(kind, str) else kind
+        self.frame[new] = self.rng.uniform(0, 4, amount)
+        self.count += amount
+
+    def kill(self, mask):
+        # mask: True for enemies to remove; survivors are compacted to the front
+        keep = ~np.asarray(mask)[:self.count]
+        kept = int(np.count_nonzero(keep))
+        for array in (self.pos, self.vel, self.kind, self.frame):
+            array[:kept] = array[:self.count][keep]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def separation_forces(self, pos):
+        # Bucket enemies into grid cells, then sum counts and positions over each
+        # cell's 3x3 block; every enemy is pushed away from its neighbours' centre.
+        cells = np.clip((pos // self.cell_size).astype(np.int32), 0, (self.grid_width - 1, self.grid_height - 1))
+        ids = cells[:, 1] * self.grid_width + cells[:, 0]
+        size = self.grid_width * self.grid_height
+        shape = (self.grid_height, self.grid_width)
+        counts = np.bincount(ids, minlength = size).reshape(shape).astype(np.float32)
+        sum_x = np.bincount(ids, weights = pos[:, 0], minlength = size).reshape(shape)
+        sum_y = np.bincount(ids, weights = pos[:, 1], minlength = size).reshape(shape)
+
+        def block_sum(grid):
+            padded = np.pad(grid, 1)
+            return sum(padded[dy:dy + self.grid_height, dx:dx + self.grid_width] for dy in range(3) for dx in range(3))
+
+        column, row = cells[:, 0], cells[:, 1]
+        neighbours = block_sum(counts)[row, column] - 1
+        centre_x = block_sum(sum_x)[row, column] - pos[:, 0]
+        centre_y = block_sum(sum_y)[row, column] - pos[:, 1]
+        crowded = neighbours > 0
+        divisor = np.where(crowded, neighbours, 1)
+        away = np.stack((pos[:, 0] - centre_x / divisor, pos[:, 1] - centre_y / divisor), axis = 1)
+        distance = np.hypot(away[:, 0], away[:, 1])[:, None] + 1e-3
+        strength = np.where(crowded, np.minimum(neighbours, 8) / 8, 0)[:, None]
+        return away / distance * strength
+
+    def update(self, dt, player_pos):
+        if not self.count:
+            return
+        live = slice(0, self.count)
+        pos = self.pos[live]
+        speed = self.kind_speeds[self.kind[live]][:, None]
+
+        # seek the player
+        to_player = np.asarray(player_pos, np.float32) - pos
+        distance = np.hypot(to_player[:, 0], to_player[:, 1])[:, None]
+        seek = np.where(distance > 1, to_player / np.maximum(distance, 1), 0)
+
+        steering = seek + self.separation_forces(pos) * self.separation
+        length = np.hypot(steering[:, 0], steering[:, 1])[:, None]
+        velocity = np.where(length > 1, steering / np.maximum(length, 1e-6), steering) * speed
+        self.vel[live] = velocity
+
+        # world collision: move each axis separately and undo it where the new
+        # centre enters a solid cell, so enemies slide along walls (enemies that
+        # spawned inside a solid cell may still walk out of it)
+        limit = self.world_size - 1
+        cells = (pos // self.tile_size).astype(np.int32)
+        inside = self.solid[cells[:, 1], cells[:, 0]]
+        for axis in (0, 1):
+            moved = pos.copy()
+            moved[:, axis] = np.clip(pos[:, axis] + velocity[:, axis] * dt, 0, limit[axis])
+            cells = (moved // self.tile_size).astype(np.int32)
+            blocked = self.solid[cells[:, 1], cells[:, 0]] & ~inside
+            pos[:, axis] = np.where(blocked, pos[:, axis], moved[:, axis])
+
+        self.frame[live] += self.animation_speed * dt
+
+    def draw(self, surface, offset):
+        if not self.count:
+            return
+        live = slice(0, self.count)
+        topleft = self.pos[live] - self.half_sizes[self.kind[live]] + np.asarray(offset, np.float32)
+        width, height = surface.get_size()
+        visible = ((topleft[:, 0] > -256) & (topleft[:, 0] < width) & (topleft[:, 1] > -256) & (topleft[:, 1] < height))
+        kinds = self.kind[live][visible].tolist()
+        frames = self.frame[live][visible].astype(np.int32).tolist()
+        positions = topleft[visible].tolist()
+        surface.fblits([(self.frames[kind][frame % len(self.frames[kind])], position) for kind, frame, position in zip(kinds, frames, positions)])
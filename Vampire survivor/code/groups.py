@@ -0,0 +1,77 @@
+from settings import *
+from bisect import bisect_right
+from common.spatial_hash import SpatialHash
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AllSprites(pygame.sprite.Group):
+    # Camera group for the large world: sprites live in a spatial hash so only
+    # the ones inside the viewport are sorted and drawn.
+    def __init__(self, cell_size = CULLING_CELL_SIZE):
+        super().__init__()
+        self.offset = pygame.Vector2()
+        self.index = SpatialHash(cell_size)
+        self.dynamic = set()
+
+        # visible sprites from the previous frame in y order, with the centery
+        # each one was placed at
+        self.visible = []
+        self.visible_keys = []
+        self.culled = 0
+        self.drawn = 0
+
+    def add_internal(self, sprite, layer = None):
+        super().add_internal(sprite, layer)
+        self.index.insert(sprite)
+        if not getattr(sprite, 'static', True):
+            self.dynamic.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.index.remove(sprite)
+        self.dynamic.discard(sprite)
+
+    def visible_sprites(self, view):
+        for sprite in self.dynamic:
+            self.index.move(sprite)
+        in_view = self.index.query(view)
+
+        ground = [sprite for sprite in in_view if getattr(sprite, 'ground', False)]
+        in_view_set = set(in_view)
+
+        # keep last frame's order, minus sprites that left the view and dynamic
+        # sprites whose centery changed; only those and newcomers are bisected
+        # back in, the rest is never re-sorted
+        ordered = []
+        keys = []
+        placed = set()
+        dynamic = self.dynamic
+        for sprite, y in zip(self.visible, self.visible_keys):
+            if sprite in in_view_set and (sprite not in dynamic or sprite.rect.centery == y):
+                ordered.append(sprite)
+                keys.append(y)
+                placed.add(sprite)
+        for sprite in in_view:
+            if sprite not in placed and not getattr(sprite, 'ground', False):
+                y = sprite.rect.centery
+                index = bisect_right(keys, y)
+                keys.insert(index, y)
+                ordered.insert(index, sprite)
+        self.visible = ordered
+        self.visible_keys = keys
+        return ground, ordered
+
+    def draw(self, surface, target_pos):
+        width, height = surface.get_size()
+        self.offset.x = -(target_pos[0] - width / 2)
+        self.offset.y = -(target_pos[1] - height / 2)
+        view = pygame.FRect(-self.offset.x, -self.offset.y, width, height)
+
+        ground, objects = self.visible_sprites(view)
+        ox, oy = self.offset
+        surface.fblits([(sprite.image, (sprite.rect.x + ox, sprite.rect.y + oy)) for layer in (ground, objects) for sprite in layer])
+
+        self.drawn = len(ground) + len(objects)
+        self.culled = len(self) - self.drawn
+        logger.debug('drew %d sprites, culled %d', self.drawn, self.culled)
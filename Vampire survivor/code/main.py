@@ -1 +1,91 @@
 from settings import *
+from sprites import *
+from groups import AllSprites
+from enemies import EnemySwarm
+from common.collision_index import CollisionIndex, TileGrid
+from common.compiled_map import load_map
+from common.gameloop import FixedTimestep
+from common.scheduler import scheduler
+from random import choice
+import logging
+
+class Game:
+    def __init__(self):
+        pygame.init()
+        self.display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption('Survivor')
+        self.clock = pygame.time.Clock()
+        self.loop = FixedTimestep(SIMULATION_STEP, MAX_CATCH_UP_STEPS)
+        self.running = True
+
+        # groups 
+        self.all_sprites = AllSprites()
+
+        # enemy timer, in game time so it follows the simulation steps
+        scheduler.schedule(ENEMY_SPAWN_INTERVAL, self.spawn_enemy, repeat = True)
+        self.spawn_positions = []
+
+        self.setup()
+
+    def load_enemy_frames(self):
+        frames = {}
+        for folder in list(walk(join('..', 'images', 'enemies')))[0][1]:
+            for folder_path, _, file_names in walk(join('..', 'images', 'enemies', folder)):
+                file_names = sorted(file_names, key = lambda name: int(name.split('.')[0]))
+                frames[folder] = [pygame.image.load(join(folder_path, file_name)).convert_alpha() for file_name in file_names]
+        return frames
+
+    def setup(self):
+        map = load_map(join('..', 'data', 'maps', 'world.tmx'))
+
+        for x, y, image in map.get_layer_by_name('Ground').tiles():
+            Sprite((x * TILE_SIZE, y * TILE_SIZE), image, self.all_sprites, ground = True)
+
+        for obj in map.get_layer_by_name('Objects'):
+            Sprite((obj.x, obj.y), obj.image, self.all_sprites)
+
+        self.collision_index = CollisionIndex.from_tmx(map, object_layers = ('Collisions', 'Objects'))
+
+        for obj in map.get_layer_by_name('Entities'):
+            if obj.name == 'Player':
+                self.player = Player((obj.x, obj.y), self.all_sprites, self.collision_index)
+            elif obj.name == 'Enemy':
+                self.spawn_positions.append((obj.x, obj.y))
+
+        world_grid = TileGrid.rasterize(self.collision_index.rects.all_rects(), map.width, map.height, TILE_SIZE)
+        self.enemies = EnemySwarm(self.load_enemy_frames(), world_grid, ENEMY_SPEEDS)
+
+    def spawn_enemy(self):
+        self.enemies.spawn(choice(self.spawn_positions), choice(self.enemies.kinds))
+
+    def spawn_swarm(self, amount):
+        for index in range(amount):
+            self.enemies.spawn(self.spawn_positions[index % len(self.spawn_positions)], index % len(self.enemies.kinds), spread = 64)
+
+    def run(self):
+        while self.running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+
+            # update in fixed steps, however long the frame took
+            for _ in self.loop.tick(self.clock):
+                scheduler.update(self.loop.step * 1000)
+                self.all_sprites.update(self.loop.step)
+                self.enemies.update(self.loop.step, self.player.rect.center)
+
+            # draw
+            self.display_surface.fill('black')
+            self.all_sprites.draw(self.display_surface, self.player.rect.center)
+            self.enemies.draw(self.display_surface, self.all_sprites.offset)
+            pygame.display.update()
+
+        pygame.quit()
+
+if __name__ == '__main__':
+    if '--debug' in sys.argv:
+        logging.basicConfig(level = logging.DEBUG)
+    game = Game()
+    if '--swarm' in sys.argv:
+        game.spawn_swarm(int(sys.argv[sys.argv.index('--swarm') + 1]))
+    game.run()
@@ -1,6 +1,16 @@
 import pygame 
-from os.path import join 
+import sys
+from os.path import join, abspath, dirname
 from os import walk
+from pytmx.util_pygame import load_pygame
+
+sys.path.append(join(dirname(abspath(__file__)), '..', '..'))
 
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280,720 
-TILE_SIZE = 64
\ No newline at end of file
+TILE_SIZE = 64
+SIMULATION_STEP = 1 / 60 # seconds per fixed update step
+MAX_CATCH_UP_STEPS = 5
+CULLING_CELL_SIZE = 256
+SWARM_CELL_SIZE = 96
+ENEMY_SPEEDS = {'bat': 260, 'blob': 160, 'skeleton': 200}
+ENEMY_SPAWN_INTERVAL = 300
\ No newline at end of file
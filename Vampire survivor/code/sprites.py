@@ -0,0 +1,71 @@
+from settings import *
+
+class Sprite(pygame.sprite.Sprite):
+    def __init__(self, pos, surf, groups, ground = False):
+        super().__init__()
+        self.image = surf
+        self.rect = self.image.get_frect(topleft = pos)
+        self.ground = ground
+        self.static = True
+        # join the groups once the rect exists, AllSprites indexes it on add
+        self.add(groups)
+
+class Player(pygame.sprite.Sprite):
+    def __init__(self, pos, groups, collision_index):
+        super().__init__()
+        self.load_images()
+        self.state, self.frame_index = 'down', 0
+        self.image = self.frames[self.state][0]
+        self.rect = self.image.get_frect(center = pos)
+        self.hitbox_rect = self.rect.inflate(-60, -90)
+        self.static = False
+        self.add(groups)
+
+        # movement
+        self.direction = pygame.Vector2()
+        self.speed = 500
+        self.collision_index = collision_index
+
+    def load_images(self):
+        self.frames = {'left': [], 'right': [], 'up': [], 'down': []}
+        for state in self.frames.keys():
+            for folder_path, _, file_names in walk(join('..', 'images', 'player', state)):
+                for file_name in sorted(file_names, key = lambda name: int(name.split('.')[0])):
+                    full_path = join(folder_path, file_name)
+                    self.frames[state].append(pygame.image.load(full_path).convert_alpha())
+
+    def input(self):
+        keys = pygame.key.get_pressed()
+        self.direction.x = int(keys[pygame.K_RIGHT]) - int(keys[pygame.K_LEFT])
+        self.direction.y = int(keys[pygame.K_DOWN]) - int(keys[pygame.K_UP])
+        self.direction = self.direction.normalize() if self.direction else self.direction
+
+    def move(self, dt):
+        self.hitbox_rect.x += self.direction.x * self.speed * dt
+        self.collision('horizontal')
+        self.hitbox_rect.y += self.direction.y * self.speed * dt
+        self.collision('vertical')
+        self.rect.center = self.hitbox_rect.center
+
+    def collision(self, direction):
+        for rect in self.collision_index.collide(self.hitbox_rect):
+            if direction == 'horizontal':
+                if self.direction.x > 0: self.hitbox_rect.right = rect.left
+                if self.direction.x < 0: self.hitbox_rect.left = rect.right
+            else:
+                if self.direction.y < 0: self.hitbox_rect.top = rect.bottom
+                if self.direction.y > 0: self.hitbox_rect.bottom = rect.top
+
+    def animate(self, dt):
+        if self.direction.x != 0:
+            self.state = 'right' if self.direction.x > 0 else 'left'
+        if self.direction.y != 0:
+            self.state = 'down' if self.direction.y > 0 else 'up'
+
+        self.frame_index = self.frame_index + 5 * dt if self.direction else 0
+        self.image = self.frames[self.state][int(self.frame_index) % len(self.frames[self.state])]
+
+    def update(self, dt):
+        self.input()
+        self.move(dt)
+        self.animate(dt)
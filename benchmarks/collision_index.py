@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+import time
+from os.path import abspath, dirname, join
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+from pytmx.util_pygame import load_pygame
+
+ROOT = join(dirname(abspath(__file__)), '..')
+sys.path.append(ROOT)
+from common.collision_index import CollisionIndex
+
+# Player/enemy-vs-world queries against the collision index compared with a
+# spritecollide scan over one sprite per solid tile or collision object.
+
+QUERIES = 20000
+MAPS = {
+    'Platform': (join(ROOT, 'Platform', 'data', 'maps', 'world.tmx'), {'tile_layers': ('Main',)}),
+    'Vampire survivor': (join(ROOT, 'Vampire survivor', 'data', 'maps', 'world.tmx'), {'object_layers': ('Collisions',)}),
+}
+
+def brute_force_group(tmx_map, tile_layers = (), object_layers = ()):
+    group = pygame.sprite.Group()
+    size = tmx_map.tilewidth
+    for name in tile_layers:
+        for x, y, gid in tmx_map.get_layer_by_name(name):
+            if gid:
+                sprite = pygame.sprite.Sprite(group)
+                sprite.rect = pygame.FRect(x * size, y * size, size, size)
+    for name in object_layers:
+        for obj in tmx_map.get_layer_by_name(name):
+            sprite = pygame.sprite.Sprite(group)
+            sprite.rect = pygame.FRect(obj.x, obj.y, obj.width, obj.height)
+    return group
+
+def movers(tmx_map):
+    width, height = tmx_map.width * tmx_map.tilewidth, tmx_map.height * tmx_map.tileheight
+    return [pygame.FRect(random.uniform(0, width), random.uniform(0, height), 48, 56) for _ in range(QUERIES)]
+
+def main():
+    random.seed(0)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    print(f'{"map":>18} {"solids":>7} {"group us":>9} {"index us":>9} {"speedup":>8}')
+    for name, (path, layers) in MAPS.items():
+        tmx_map = load_pygame(path)
+        group = brute_force_group(tmx_map, **layers)
+        index = CollisionIndex.from_tmx(tmx_map, **layers)
+        rects = movers(tmx_map)
+        probe = pygame.sprite.Sprite()
+
+        start = time.perf_counter()
+        group_hits = 0
+        for rect in rects:
+            probe.rect = rect
+            group_hits += len(pygame.sprite.spritecollide(probe, group, False))
+        group_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index_hits = 0
+        for rect in rects:
+            index_hits += len(index.collide(rect))
+        index_time = time.perf_counter() - start
+
+        assert group_hits == index_hits, (group_hits, index_hits)
+        group_us = group_time / QUERIES * 1e6
+        index_us = index_time / QUERIES * 1e6
+        print(f'{name:>18} {len(group):>7} {group_us:>9.2f} {index_us:>9.2f} {group_us / index_us:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+import argparse
+import json
+import os
+import random
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from os.path import abspath, dirname, join
+
+# Headless, deterministic frame-time benchmark for every game loop.
+#
+# Each game runs in its own process with the SDL dummy drivers. The harness
+# swaps in a fixed-step clock, simulated get_ticks/set_timer, scripted key
+# state and a frame counter on display.update/flip, then reports per-phase
+# timings as JSON. Phases are inferred from the pygame calls a game makes
+# (event.get, Group.update, sprite collision helpers, Group.draw, flip) plus
+# any module-level functions listed under 'phases' below.
+
+ROOT = join(dirname(abspath(__file__)), '..')
+PHASES = ('events', 'update', 'collisions', 'draw', 'flip', 'other')
+
+
+class BenchmarkDone(Exception):
+    pass
+
+
+def sweep(keys, period, hold = ()):
+    # cycle through keys, holding each one for period frames
+    def pressed(frame):
+        return {keys[(frame // period) % len(keys)], *hold}
+    return pressed
+
+
+def game_configs(pygame):
+    return {
+        'space shooter': {
+            'script': join('space shooter', 'main.py'),
+            'input': sweep((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN), 40, hold = (pygame.K_SPACE,)),
+            'phases': {'collisions': ('collisions', 'draw'), 'display_score': ('draw', 'draw')},
+        },
+        'ramming speed': {
+            'script': join('ramming speed', 'main.py'),
+            'input': sweep((pygame.K_LEFT, pygame.K_RIGHT), 45),
+        },
+        'ramming speed stress': {
+            'script': join('ramming speed', 'main.py'),
+            'args': ('--stress',),
+            'input': sweep((pygame.K_LEFT, pygame.K_RIGHT), 45),
+        },
+        'Monster battle': {
+            'script': join('Monster battle', 'code', 'main.py'),
+            'input': sweep((pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE), 30),
+        },
+        'Platform': {
+            'script': join('Platform', 'code', 'main.py'),
+            'input': sweep((pygame.K_LEFT, pygame.K_RIGHT), 90, hold = (pygame.K_SPACE,)),
+        },
+        'Pong': {
+            'script': join('Pong', 'code', 'main.py'),
+            'input': sweep((pygame.K_UP, pygame.K_DOWN), 20),
+        },
+        'Vampire survivor': {
+            'script': join('Vampire survivor', 'code', 'main.py'),
+            'input': sweep((pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN), 60),
+        },
+    }
+
+
+class ScriptedKeys:
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class Harness:
+    def __init__(self, pygame, frames, dt, script_input, phase_functions):
+        self.pygame = pygame
+        self.frames = frames
+        self.dt_ms = dt * 1000
+        self.script_input = script_input
+        self.phase_functions = phase_functions
+
+        # simulated time
+        self.ticks = 0.0
+        self.timers = {}
+
+        # measurements
+        self.frame = 0
+        self.phase = 'other'
+        self.mark_time = time.perf_counter()
+        self.frame_start = self.mark_time
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.phase_samples = {phase: [] for phase in PHASES}
+        self.frame_samples = []
+        self.keys = ScriptedKeys(script_input(0))
+        self.previous_keys = set()
+        self.started = False
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.current[self.phase] += now - self.mark_time
+        self.mark_time = now
+        self.phase = phase
+
+    def end_frame(self):
+        self.mark('other')
+        self.frame_samples.append(self.mark_time - self.frame_start)
+        for phase, seconds in self.current.items():
+            self.phase_samples[phase].append(seconds)
+            self.current[phase] = 0.0
+        self.frame_start = self.mark_time
+        self.frame += 1
+
+        self.previous_keys = self.keys.pressed
+        self.keys = ScriptedKeys(self.script_input(self.frame))
+        if self.frame >= self.frames:
+            raise BenchmarkDone
+
+    def start(self, namespace):
+        # first event.get: the game loop is running, setup time is not counted
+        for name, (phase, after) in self.phase_functions.items():
+            func = namespace.get(name)
+            if callable(func):
+                namespace[name] = self.phase_wrapper(func, phase, after)
+        self.mark_time = self.frame_start = time.perf_counter()
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.started = True
+
+    def phase_wrapper(self, func, phase, after):
+        def wrapper(*args, **kwargs):
+            self.mark(phase)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.mark(after)
+        return wrapper
+
+    def install(self):
+        pygame = self.pygame
+        harness = self
+
+        class FixedClock:
+            def __init__(self):
+                self.time = 0
+
+            def tick(self, framerate = 0):
+                harness.ticks += harness.dt_ms
+                self.time = harness.dt_ms
+                return harness.dt_ms
+
+            tick_busy_loop = tick
+
+            def get_time(self):
+                return self.time
+
+            def get_rawtime(self):
+                return self.time
+
+            def get_fps(self):
+                return 1000 / harness.dt_ms
+
+        def get_ticks():
+            return int(harness.ticks)
+
+        def set_timer(event, millis, loops = 0):
+            event_type = event.type if isinstance(event, pygame.event.EventType) else event
+            if millis <= 0:
+                harness.timers.pop(event_type, None)
+            else:
+                event = event if isinstance(event, pygame.event.EventType) else pygame.event.Event(event)
+                harness.timers[event_type] = [harness.ticks + millis, millis, loops, event]
+
+        original_get = pygame.event.get
+        def get_events(*args, **kwargs):
+            if not harness.started:
+                harness.start(sys._getframe(1).f_globals)
+            harness.mark('events')
+            events = original_get(*args, **kwargs)
+            for event_type, timer in list(harness.timers.items()):
+                while timer[0] <= harness.ticks:
+                    events.append(timer[3])
+                    timer[0] += timer[1]
+                    if timer[2]:
+                        timer[2] -= 1
+                        if not timer[2]:
+                            del harness.timers[event_type]
+                            break
+            harness.mark('update')
+            return events
+
+        def wrap_display(func):
+            def wrapper(*args, **kwargs):
+                harness.mark('flip')
+                result = func(*args, **kwargs)
+                harness.end_frame()
+                return result
+            return wrapper
+
+        def wrap_phase(func, phase, after = None):
+            def wrapper(*args, **kwargs):
+                harness.mark(phase)
+                result = func(*args, **kwargs)
+                if after:
+                    harness.mark(after)
+                return result
+            return wrapper
+
+        pygame.time.Clock = FixedClock
+        pygame.time.get_ticks = get_ticks
+        pygame.time.set_timer = set_timer
+        pygame.event.get = get_events
+        pygame.key.get_pressed = lambda: harness.keys
+        pygame.key.get_just_pressed = lambda: ScriptedKeys(harness.keys.pressed - harness.previous_keys)
+        pygame.key.get_just_released = lambda: ScriptedKeys(harness.previous_keys - harness.keys.pressed)
+        pygame.display.update = wrap_display(pygame.display.update)
+        pygame.display.flip = wrap_display(pygame.display.flip)
+
+        sprite = pygame.sprite
+        sprite.AbstractGroup.update = wrap_phase(sprite.AbstractGroup.update, 'update', 'collisions')
+        sprite.AbstractGroup.draw = wrap_phase(sprite.AbstractGroup.draw, 'draw')
+        for name in ('spritecollide', 'spritecollideany', 'groupcollide'):
+            setattr(sprite, name, wrap_phase(getattr(sprite, name), 'collisions'))
+
+    def report(self):
+        return {
+            'frames': self.frame,
+            'frame_ms': summarize(self.frame_samples),
+            'phases_ms': {phase: summarize(samples) for phase, samples in self.phase_samples.items() if any(samples)},
+        }
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        'mean': round(sum(ordered) / count * 1000, 4) if count else 0.0,
+        'p50': round(percentile(ordered, 0.50) * 1000, 4),
+        'p95': round(percentile(ordered, 0.95) * 1000, 4),
+        'p99': round(percentile(ordered, 0.99) * 1000, 4),
+        'max': round(ordered[-1] * 1000, 4) if count else 0.0,
+    }
+
+
+def run_child(name, frames, dt, seed, trace_memory):
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    import pygame
+
+    config = game_configs(pygame)[name]
+    script = abspath(join(ROOT, config['script']))
+    random.seed(seed)
+    harness = Harness(pygame, frames, dt, config['input'], config.get('phases', {}))
+    harness.install()
+
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    os.chdir(dirname(script))
+    sys.path.insert(0, dirname(script))
+    sys.argv = [script, *config.get('args', ())]
+    result = {'game': name, 'dt': dt, 'seed': seed, 'requested_frames': frames}
+    start = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name = '__main__')
+    except BenchmarkDone:
+        pass
+    except SystemExit:
+        pass
+    except Exception as error:
+        result['error'] = f'{type(error).__name__}: {error}'
+        result['traceback'] = traceback.format_exc()
+    result['wall_s'] = round(time.perf_counter() - start, 4)
+    result.update(harness.report())
+    result['completed'] = harness.frame >= frames
+    if harness.frame == 0 and 'error' not in result:
+        result['note'] = 'script returned without running a frame'
+    result['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if trace_memory:
+        result['peak_traced_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Run every game headless for a fixed number of frames and report timings as JSON.')
+    parser.add_argument('games', nargs = '*', help = 'games to run (default: all)')
+    parser.add_argument('--frames', type = int, default = 1000)
+    parser.add_argument('--dt', type = float, default = 1 / 60, help = 'simulated seconds per frame')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--tracemalloc', action = 'store_true', help = 'also report the peak Python heap (slows frames down)')
+    parser.add_argument('--output', help = 'write the JSON report here instead of stdout')
+    parser.add_argument('--child', help = argparse.SUPPRESS)
+    parser.add_argument('--result', help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_child(args.child, args.frames, args.dt, args.seed, args.tracemalloc)
+        with open(args.result, 'w') as file:
+            json.dump(result, file)
+        return
+
+    names = args.games or ['space shooter', 'ramming speed', 'Monster battle', 'Platform', 'Pong', 'Vampire survivor']
+    report = {}
+    for name in names:
+        with tempfile.TemporaryDirectory() as folder:
+            result_path = join(folder, 'result.json')
+            command = [sys.executable, abspath(__file__), '--child', name, '--result', result_path,
+                       '--frames', str(args.frames), '--dt', str(args.dt), '--seed', str(args.seed)]
+            if args.tracemalloc:
+                command.append('--tracemalloc')
+            process = subprocess.run(command, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE, text = True)
+            try:
+                with open(result_path) as file:
+                    report[name] = json.load(file)
+            except FileNotFoundError:
+                report[name] = {'game': name, 'error': f'benchmark process exited with {process.returncode}', 'stderr': process.stderr[-2000:]}
+
+    output = json.dumps(report, indent = 2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+from os.path import abspath, dirname, join
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+from pytmx.util_pygame import load_pygame
+
+sys.path.append(join(dirname(abspath(__file__)), '..'))
+from common.compiled_map import CompiledMap, compile_map
+
+# TMX loading with pytmx against the compiled map format, for every game
+# that ships a Tiled map:
+#
+# load_pygame: parse the XML, decode the tile data and cut a surface per gid
+# compile:     the same parse once, written to a .tmxc file (the cold path)
+# load_map:    header, memory-mapped arrays and one surface per unique region
+# data only:   load_map without images, i.e. what a server or tool would load
+
+ROOT = join(dirname(abspath(__file__)), '..')
+MAPS = {
+    'Platform': join(ROOT, 'Platform', 'data', 'maps', 'world.tmx'),
+    'Vampire survivor': join(ROOT, 'Vampire survivor', 'data', 'maps', 'world.tmx'),
+}
+ROUNDS = 20
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    print(f'best of {ROUNDS}')
+    for game, tmx_path in MAPS.items():
+        # compiled into the map's folder so the relative image paths resolve
+        path = join(dirname(tmx_path), f'.benchmark-{os.getpid()}.tmxc')
+        try:
+            pytmx_ms = min(timed(load_pygame, tmx_path) for _ in range(ROUNDS))
+            compile_ms = min(timed(compile_map, tmx_path, path) for _ in range(ROUNDS))
+            warm_ms = min(timed(CompiledMap, path) for _ in range(ROUNDS))
+            data_ms = min(timed(CompiledMap, path, load_images = False) for _ in range(ROUNDS))
+            size = os.path.getsize(path)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+        print(f'{game} ({os.path.getsize(tmx_path)} byte TMX, {size} byte compiled)')
+        print(f'  load_pygame: {pytmx_ms:8.2f} ms')
+        print(f'  compile:     {compile_ms:8.2f} ms')
+        print(f'  load_map:    {warm_ms:8.2f} ms ({pytmx_ms / warm_ms:.1f}x faster)')
+        print(f'  data only:   {data_ms:8.2f} ms ({pytmx_ms / data_ms:.1f}x faster)')
+
+if __name__ == '__main__':
+    main()
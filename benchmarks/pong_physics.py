@@ -0,0 +1,144 @@
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import cos, pi, sin
+from os.path import abspath, dirname, join
+
+sys.path.append(join(dirname(abspath(__file__)), '..', 'Pong', 'code'))
+from physics import Body, predict_intercept, step_ball
+
+# Fuzzes and times the Pong ball physics headless. Every rally serves a ball
+# with a random size, speed and angle and steps it with a random dt (from
+# 1/240 s up to a whole second per step) until it leaves the court.
+#
+# static: paddles stand still, so whether the ball must hit a paddle is known
+#         exactly from predict_intercept; a ball that gets past a paddle it
+#         should have hit has tunnelled.
+# moving: both paddles chase the predicted intercept at a random top speed;
+#         the ball must never end a step overlapping a paddle or outside the
+#         walls.
+
+WIDTH, HEIGHT = 1280, 720
+PADDLE_SIZE = (40, 100)
+PADDLE_SPEEDS = (100, 3000)
+DTS = (1 / 240, 1 / 120, 1 / 60, 1 / 15, 0.25, 1.0)
+MAX_STEPS = 2000
+EPSILON = 1e-6
+
+def serve(rng):
+    size = rng.uniform(4, 60)
+    speed = rng.uniform(200, 20000)
+    angle = rng.uniform(-pi / 3, pi / 3) + rng.choice((0, pi))
+    ball = Body(0, 0, size, size, cos(angle) * speed, sin(angle) * speed)
+    ball.center = (WIDTH / 2, rng.uniform(size, HEIGHT - size))
+    return ball
+
+def paddles(rng):
+    left = Body(30, rng.uniform(0, HEIGHT - PADDLE_SIZE[1]), *PADDLE_SIZE)
+    right = Body(WIDTH - 30 - PADDLE_SIZE[0], rng.uniform(0, HEIGHT - PADDLE_SIZE[1]), *PADDLE_SIZE)
+    return left, right
+
+def should_hit(ball, left, right):
+    # the paddle the ball has to hit next, decided at its crossing of the paddle face
+    paddle, face_x = (right, right.x) if ball.vx > 0 else (left, left.x + left.w)
+    if (ball.vx > 0 and ball.x + ball.w > face_x) or (ball.vx < 0 and ball.x < face_x):
+        return None
+    center = predict_intercept(ball, face_x, 0, HEIGHT)
+    if center is None:
+        return None
+    top, bottom = center - ball.h / 2, center + ball.h / 2
+    if top < paddle.y + paddle.h - EPSILON and bottom > paddle.y + EPSILON:
+        return paddle
+    return None
+
+def overlaps(ball, body):
+    return (ball.x < body.x + body.w - EPSILON and ball.x + ball.w > body.x + EPSILON and
+            ball.y < body.y + body.h - EPSILON and ball.y + ball.h > body.y + EPSILON)
+
+def steer(paddle, ball, face_x, speed, dt):
+    target = predict_intercept(ball, face_x, 0, HEIGHT)
+    target = HEIGHT / 2 if target is None else target
+    paddle.vy = max(-speed, min(speed, (target - paddle.y - paddle.h / 2) / dt))
+
+def static_rally(rng):
+    ball = serve(rng)
+    left, right = paddles(rng)
+    dt = rng.choice(DTS)
+    expected = should_hit(ball, left, right)
+    bounces = 0
+    for _ in range(MAX_STEPS):
+        hits = step_ball(ball, (left, right), dt, 0, HEIGHT)
+        bounces += len(hits)
+        if hits:
+            expected = should_hit(ball, left, right)
+        if ball.x + ball.w < 0 or ball.x > WIDTH:
+            if expected is not None:
+                return bounces, 'tunnelled through a paddle'
+            return bounces, None
+    return bounces, None
+
+def moving_rally(rng):
+    ball = serve(rng)
+    left, right = paddles(rng)
+    dt = rng.choice(DTS)
+    speed = rng.uniform(*PADDLE_SPEEDS)
+    bounces = 0
+    for _ in range(MAX_STEPS):
+        steer(left, ball, left.x + left.w, speed, dt)
+        steer(right, ball, right.x, speed, dt)
+        hits = step_ball(ball, (left, right), dt, 0, HEIGHT)
+        bounces += len(hits)
+        for paddle in (left, right):
+            paddle.y = min(max(paddle.y + paddle.vy * dt, 0), HEIGHT - paddle.h)
+            if overlaps(ball, paddle):
+                return bounces, 'ended a step inside a paddle'
+        if ball.y < -EPSILON or ball.y + ball.h > HEIGHT + EPSILON:
+            return bounces, 'left the court through a wall'
+        if ball.x + ball.w < 0 or ball.x > WIDTH:
+            return bounces, None
+    return bounces, None
+
+def run_chunk(job):
+    mode, seed, rallies = job
+    rng = random.Random(seed)
+    rally = static_rally if mode == 'static' else moving_rally
+    bounces = 0
+    failures = []
+    for index in range(rallies):
+        rally_bounces, failure = rally(rng)
+        bounces += rally_bounces
+        if failure and len(failures) < 10:
+            failures.append((seed, index, failure))
+    return bounces, failures
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Pong physics fuzz test and benchmark')
+    parser.add_argument('--rallies', type = int, default = 1_000_000)
+    parser.add_argument('--mode', choices = ('static', 'moving'), default = 'static')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--workers', type = int, default = os.cpu_count())
+    args = parser.parse_args()
+
+    chunks = max(1, args.workers * 4)
+    per_chunk = -(-args.rallies // chunks)
+    jobs = [(args.mode, args.seed * 1_000_003 + chunk, per_chunk) for chunk in range(chunks)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as executor:
+        results = list(executor.map(run_chunk, jobs))
+    elapsed = time.perf_counter() - start
+
+    rallies = per_chunk * chunks
+    bounces = sum(result[0] for result in results)
+    failures = [failure for result in results for failure in result[1]]
+    print(f'{args.mode}: {rallies} rallies, {bounces} bounces in {elapsed:.2f} s '
+          f'({rallies / elapsed:,.0f} rallies/s, {bounces / elapsed:,.0f} bounces/s)')
+    for seed, index, failure in failures[:10]:
+        print(f'  seed {seed} rally {index}: {failure}')
+    print('FAIL' if failures else 'OK')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import time
+from os.path import abspath, dirname, join
+
+import numpy as np
+
+sys.path.append(join(dirname(abspath(__file__)), '..', 'ramming speed'))
+from env import RammingSpeedEnv, VectorEnv
+
+# Steps per second of the headless ramming speed environment, first a single
+# env in this process and then a VectorEnv over worker processes, with random
+# actions. Episodes are 3600 steps (one 60 second game).
+
+def bench_single(steps, observation):
+    env = RammingSpeedEnv(seed=0, observation=observation)
+    env.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 3, steps).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+def bench_vector(envs, workers, steps, observation):
+    rng = np.random.default_rng(0)
+    with VectorEnv(envs, workers, observation=observation) as vector:
+        vector.reset()
+        start = time.perf_counter()
+        for _ in range(steps):
+            vector.step(rng.integers(0, 3, envs))
+        elapsed = time.perf_counter() - start
+        scores = vector.episode_scores
+    return envs * steps / elapsed, scores
+
+def main():
+    parser = argparse.ArgumentParser(description = 'ramming speed environment throughput')
+    parser.add_argument('--envs', type = int, default = 64)
+    parser.add_argument('--workers', type = int, default = os.cpu_count())
+    parser.add_argument('--steps', type = int, default = 2000, help = 'vector steps (each steps every env)')
+    parser.add_argument('--observation', choices = ('state', 'pixels', 'none'), default = 'state')
+    args = parser.parse_args()
+    observation = None if args.observation == 'none' else args.observation
+
+    single = bench_single(args.steps * 4, observation)
+    print(f'single env ({args.observation}): {single:,.0f} steps/s')
+    rate, scores = bench_vector(args.envs, args.workers, args.steps, observation)
+    mean_score = f', mean episode score {np.mean(scores):.0f}' if scores else ''
+    print(f'{args.envs} envs on {args.workers} workers ({args.observation}): {rate:,.0f} steps/s, '
+          f'{len(scores)} episodes{mean_score}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import os
+import random
+import sys
+import time
+from os.path import abspath, dirname, join
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+sys.path.append(join(dirname(abspath(__file__)), '..'))
+from common.spatial_hash import SpatialHash
+
+# Compares the old per-laser spritecollide scan with the grid broad-phase.
+# The playfield grows with the sprite count so density stays game-like.
+
+SIZES = (100, 250, 500, 1000, 2000)
+ROUNDS = 5
+
+def make_sprites(count, surf, area):
+    group = pygame.sprite.Group()
+    mask = pygame.mask.from_surface(surf)
+    for _ in range(count):
+        sprite = pygame.sprite.Sprite(group)
+        sprite.image = surf
+        sprite.mask = mask
+        sprite.rect = surf.get_frect(center = (random.uniform(0, area[0]), random.uniform(0, area[1])))
+    return group
+
+def brute_force(lasers, meteors):
+    hits = 0
+    for laser in lasers:
+        hits += len(pygame.sprite.spritecollide(laser, meteors, False, pygame.sprite.collide_mask))
+    return hits
+
+def spatial_hash(lasers, meteors, grid):
+    grid.sync(meteors)
+    hits = 0
+    for laser, meteor in grid.pairs(lasers):
+        if pygame.sprite.collide_mask(laser, meteor):
+            hits += 1
+    return hits
+
+def jiggle(group):
+    for sprite in group:
+        sprite.rect.move_ip(random.uniform(-8, 8), random.uniform(-8, 8))
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    random.seed(0)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    laser_surf = pygame.Surface((10, 40), pygame.SRCALPHA)
+    laser_surf.fill('white')
+    meteor_surf = pygame.Surface((100, 90), pygame.SRCALPHA)
+    pygame.draw.circle(meteor_surf, 'white', (50, 45), 45)
+
+    print(f'{"sprites":>8} {"brute ms":>10} {"hash ms":>10} {"speedup":>8} {"hits":>6}')
+    for count in SIZES:
+        scale = (count / 20) ** 0.5
+        area = (1280 * scale, 720 * scale)
+        lasers = make_sprites(count, laser_surf, area)
+        meteors = make_sprites(count, meteor_surf, area)
+        grid = SpatialHash(128)
+
+        brute_total = hash_total = 0
+        for _ in range(ROUNDS):
+            jiggle(lasers)
+            jiggle(meteors)
+            brute_time, brute_hits = timed(brute_force, lasers, meteors)
+            hash_time, hash_hits = timed(spatial_hash, lasers, meteors, grid)
+            assert brute_hits == hash_hits
+            brute_total += brute_time
+            hash_total += hash_time
+
+        brute_ms = brute_total / ROUNDS * 1000
+        hash_ms = hash_total / ROUNDS * 1000
+        print(f'{count:>8} {brute_ms:>10.2f} {hash_ms:>10.2f} {brute_ms / hash_ms:>7.1f}x {hash_hits:>6}')
+
+if __name__ == '__main__':
+    main()
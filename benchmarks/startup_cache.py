@@ -0,0 +1,65 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from glob import glob
+from os.path import abspath, dirname, join
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+GAME = join(dirname(abspath(__file__)), '..', 'ramming speed')
+sys.path.append(GAME)
+from asset_cache import AssetCache, upscale_image
+
+# Cold vs warm startup for ramming speed's processed images: every PNG scaled
+# by PIXEL_SCALE, plus the mirrored right-facing copies of the left frames.
+
+PIXEL_SCALE = 3
+ROUNDS = 10
+
+def jobs():
+    paths = sorted(glob(join(GAME, 'images', '**', '*.png'), recursive = True))
+    left_frames = [path for path in paths if 'zombie' in path and os.path.basename(path) in ('4.png', '5.png', '6.png')]
+    return [(path, False) for path in paths] + [(path, True) for path in left_frames]
+
+def uncached(work):
+    for path, flip in work:
+        surface = upscale_image(pygame.image.load(path).convert_alpha(), PIXEL_SCALE)
+        if flip:
+            pygame.transform.flip(surface, True, False)
+
+def cached(work, folder):
+    cache = AssetCache(folder)
+    for path, flip in work:
+        cache.load(path, PIXEL_SCALE, flip)
+    return cache
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    work = jobs()
+    folder = tempfile.mkdtemp()
+    try:
+        uncached_ms = min(timed(uncached, work) for _ in range(ROUNDS))
+        cold_ms = []
+        for _ in range(ROUNDS):
+            shutil.rmtree(folder)
+            cold_ms.append(timed(cached, work, folder))
+        warm_ms = min(timed(cached, work, folder) for _ in range(ROUNDS))
+    finally:
+        shutil.rmtree(folder, ignore_errors = True)
+
+    print(f'{len(work)} surfaces, best of {ROUNDS}')
+    print(f'no cache:   {uncached_ms:8.2f} ms')
+    print(f'cold cache: {min(cold_ms):8.2f} ms (decode, scale and write)')
+    print(f'warm cache: {warm_ms:8.2f} ms ({uncached_ms / warm_ms:.1f}x faster than no cache)')
+
+if __name__ == '__main__':
+    main()
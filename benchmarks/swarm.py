@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+import time
+from os.path import abspath, dirname, join
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+from pytmx.util_pygame import load_pygame
+
+ROOT = join(dirname(abspath(__file__)), '..')
+GAME = join(ROOT, 'Vampire survivor', 'code')
+sys.path.append(GAME)
+from settings import ENEMY_SPEEDS, TILE_SIZE
+from enemies import EnemySwarm
+from common.collision_index import CollisionIndex, TileGrid
+
+# Spawns N enemies on the Vampire survivor map and times EnemySwarm.update
+# (seek, separation and world collision) per enemy, plus the culled draw.
+
+FRAME_BUDGET_MS = 1000 / 60
+
+def load_frames():
+    frames = {}
+    folder = join(GAME, '..', 'images', 'enemies')
+    for kind in sorted(os.listdir(folder)):
+        names = sorted(os.listdir(join(folder, kind)), key = lambda name: int(name.split('.')[0]))
+        frames[kind] = [pygame.image.load(join(folder, kind, name)).convert_alpha() for name in names]
+    return frames
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('counts', nargs = '*', type = int, default = [500, 1000, 2000, 5000, 10000])
+    parser.add_argument('--frames', type = int, default = 120)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    tmx_map = load_pygame(join(GAME, '..', 'data', 'maps', 'world.tmx'))
+    index = CollisionIndex.from_tmx(tmx_map, object_layers = ('Collisions', 'Objects'))
+    grid = TileGrid.rasterize(index.rects.all_rects(), tmx_map.width, tmx_map.height, TILE_SIZE)
+    spawns = [(obj.x, obj.y) for obj in tmx_map.get_layer_by_name('Entities') if obj.name == 'Enemy']
+    player = next((obj.x, obj.y) for obj in tmx_map.get_layer_by_name('Entities') if obj.name == 'Player')
+    frames = load_frames()
+
+    print(f'{"enemies":>8} {"update ms":>10} {"us/enemy":>9} {"draw ms":>8} {"60 fps":>7}')
+    for count in args.counts:
+        swarm = EnemySwarm(frames, grid, ENEMY_SPEEDS, seed = 0)
+        for index in range(count):
+            swarm.spawn(spawns[index % len(spawns)], index % len(swarm.kinds), spread = 64)
+        # settle for a second so the timed frames see a spread-out swarm
+        for _ in range(60):
+            swarm.update(1 / 60, player)
+
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            swarm.update(1 / 60, player)
+        update_ms = (time.perf_counter() - start) / args.frames * 1000
+
+        offset = (640 - player[0], 360 - player[1])
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            swarm.draw(screen, offset)
+        draw_ms = (time.perf_counter() - start) / args.frames * 1000
+
+        fits = 'yes' if update_ms + draw_ms < FRAME_BUDGET_MS else 'no'
+        print(f'{count:>8} {update_ms:>10.3f} {update_ms * 1000 / count:>9.3f} {draw_ms:>8.3f} {fits:>7}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import pygame
+
+# Animation frames with their collision data computed once at load: the mask,
+# the tight bounding rect of the opaque pixels and their centroid. Sprites
+# switch frames by index and never build a mask while the game runs.
+#
+# collide() is a two-stage test: the tight rects first, which rejects almost
+# every pair, and a mask overlap only for the pairs that get through.
+
+class AnimationFrame:
+    __slots__ = ('surface', 'mask', 'bounds', 'centroid')
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.mask = pygame.mask.from_surface(surface)
+        rects = self.mask.get_bounding_rects()
+        # fully transparent frames get an empty rect and never collide
+        self.bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+        self.centroid = self.mask.centroid()
+
+class Animation:
+    def __init__(self, surfaces):
+        self.frames = [AnimationFrame(surface) for surface in surfaces]
+        self.surfaces = [frame.surface for frame in self.frames]
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self):
+        return iter(self.frames)
+
+def collide(frame_a, pos_a, frame_b, pos_b):
+    # pos is where each frame's surface is blitted; returns the first
+    # overlapping pixel relative to frame_a, or None
+    ax, ay = int(pos_a[0]), int(pos_a[1])
+    bx, by = int(pos_b[0]), int(pos_b[1])
+    if not frame_a.bounds.move(ax, ay).colliderect(frame_b.bounds.move(bx, by)):
+        return None
+    return frame_a.mask.overlap(frame_b.mask, (bx - ax, by - ay))
+
+def collide_sprites(sprite_a, sprite_b):
+    # pygame.sprite collided= callback for sprites with a `frame` and a `rect`
+    return collide(sprite_a.frame, sprite_a.rect.topleft, sprite_b.frame, sprite_b.rect.topleft)
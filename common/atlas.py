@@ -0,0 +1,129 @@
+import json
+import math
+import os
+import sys
+from os.path import exists, getmtime, join, relpath, splitext
+
+import pygame
+
+# Packs many small frames into one texture. Frames are handed out as
+# subsurfaces, so animations keep indexing plain Surfaces while every blit
+# reads from the same block of pixels.
+#
+# Build step:  python -m common.atlas <folder> [<folder> ...]
+# writes <folder>.atlas.png and <folder>.atlas.json next to each folder.
+# load_atlas() uses those files when they are newer than the folder's images
+# and packs the folder in memory otherwise.
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tga')
+
+class Atlas:
+    def __init__(self, surface, rects):
+        self.surface = surface
+        self.rects = {name: pygame.Rect(rect) for name, rect in rects.items()}
+        self.frames = {name: surface.subsurface(rect) for name, rect in self.rects.items()}
+
+    def __getitem__(self, name):
+        return self.frames[name]
+
+    def __contains__(self, name):
+        return name in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def keys(self):
+        return self.frames.keys()
+
+    def sequence(self, names):
+        return [self.frames[name] for name in names]
+
+    def index(self):
+        return {
+            'size': list(self.surface.get_size()),
+            'frames': {name: list(rect) for name, rect in self.rects.items()},
+        }
+
+    @classmethod
+    def from_surfaces(cls, surfaces, padding = 1):
+        rects, size = pack({name: surf.get_size() for name, surf in surfaces.items()}, padding)
+        texture = pygame.Surface(size, pygame.SRCALPHA)
+        texture.blits([(surfaces[name], rect) for name, rect in rects.items()], doreturn = False)
+        if pygame.display.get_surface():
+            texture = texture.convert_alpha()
+        return cls(texture, rects)
+
+def pack(sizes, padding = 1):
+    # shelf packing: tallest frames first, rows roughly as wide as the atlas is tall
+    if not sizes:
+        return {}, (1, 1)
+    area = sum((w + padding) * (h + padding) for w, h in sizes.values())
+    max_width = max(w for w, _ in sizes.values()) + padding
+    row_width = max(max_width, int(math.sqrt(area)))
+
+    rects = {}
+    x = y = shelf_height = used_width = 0
+    for name, (w, h) in sorted(sizes.items(), key = lambda item: (-item[1][1], item[0])):
+        if x and x + w > row_width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        rects[name] = pygame.Rect(x, y, w, h)
+        x += w + padding
+        used_width = max(used_width, x - padding)
+        shelf_height = max(shelf_height, h)
+    return rects, (used_width, y + shelf_height)
+
+def frame_paths(folder):
+    paths = {}
+    for folder_path, _, file_names in os.walk(folder):
+        for file_name in sorted(file_names):
+            name, extension = splitext(file_name)
+            if extension.lower() in IMAGE_EXTENSIONS:
+                path = join(folder_path, file_name)
+                paths[relpath(join(folder_path, name), folder).replace(os.sep, '/')] = path
+    return paths
+
+def atlas_paths(folder):
+    folder = folder.rstrip('/\\')
+    return f'{folder}.atlas.png', f'{folder}.atlas.json'
+
+def load_surfaces(paths):
+    surfaces = {}
+    for name, path in paths.items():
+        surf = pygame.image.load(path)
+        surfaces[name] = surf.convert_alpha() if pygame.display.get_surface() else surf
+    return surfaces
+
+def pack_folder(folder, padding = 1, loader = load_surfaces):
+    # loader: {name: path} -> {name: surface}, e.g. one that decodes on threads
+    return Atlas.from_surfaces(loader(frame_paths(folder)), padding)
+
+def build_atlas(folder, padding = 1):
+    atlas = pack_folder(folder, padding)
+    image_path, index_path = atlas_paths(folder)
+    pygame.image.save(atlas.surface, image_path)
+    with open(index_path, 'w') as file:
+        json.dump(atlas.index(), file, indent = 1)
+    return atlas
+
+def load_atlas(folder, padding = 1, loader = load_surfaces):
+    image_path, index_path = atlas_paths(folder)
+    if exists(image_path) and exists(index_path):
+        newest_source = max((getmtime(path) for path in frame_paths(folder).values()), default = 0)
+        if min(getmtime(image_path), getmtime(index_path)) >= newest_source:
+            with open(index_path) as file:
+                index = json.load(file)
+            surface = pygame.image.load(image_path)
+            if pygame.display.get_surface():
+                surface = surface.convert_alpha()
+            return Atlas(surface, index['frames'])
+    return pack_folder(folder, padding, loader)
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit('usage: python -m common.atlas <folder> [<folder> ...]')
+    for folder in sys.argv[1:]:
+        atlas = build_atlas(folder)
+        width, height = atlas.surface.get_size()
+        print(f'{atlas_paths(folder)[0]}: {len(atlas)} frames, {width}x{height}')
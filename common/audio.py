@@ -0,0 +1,151 @@
+import time
+
+import pygame
+
+# Sound effect dispatcher. Games call play(name) as often as they like; the
+# requests are collected and handed to the mixer once per frame in update():
+#
+# - identical sounds requested in the same frame become one voice
+# - each sound has a voice cap; past it the sound restarts its own oldest voice
+# - when every channel is busy, a sound takes the channel of the oldest voice
+#   with the lowest priority that is not above its own, or is dropped
+#
+# Channels are assigned here instead of by Sound.play(), so a burst of one
+# sound cannot push every other sound out of the mixer. Music streams from
+# disk through pygame.mixer.music. Without a mixer (no audio device) every
+# call is a no-op, and the SDL dummy driver works like a real one.
+
+class SoundEffect:
+    __slots__ = ('name', 'sound', 'max_voices', 'priority')
+
+    def __init__(self, name, sound, max_voices, priority):
+        self.name = name
+        self.sound = sound
+        self.max_voices = max_voices
+        self.priority = priority
+
+class AudioManager:
+    def __init__(self, channels = 16):
+        self.enabled = pygame.mixer.get_init() is not None
+        self.effects = {}
+        self.pending = {}
+        if self.enabled:
+            pygame.mixer.set_num_channels(channels)
+            self.channels = [pygame.mixer.Channel(index) for index in range(channels)]
+        else:
+            self.channels = []
+        # channel index -> (effect, start order) of the voice playing there
+        self.voices = {}
+        self.order = 0
+
+        # stats
+        self.requested = 0
+        self.played = 0
+        self.coalesced = 0
+        self.restarted = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.peak_voices = 0
+        self.window_start = time.perf_counter()
+        self.window_counts = (0, 0)
+        self.played_per_second = 0.0
+        self.dropped_per_second = 0.0
+
+    def add(self, name, sound, max_voices = 2, priority = 0, volume = None):
+        if volume is not None and sound is not None:
+            sound.set_volume(volume)
+        self.effects[name] = effect = SoundEffect(name, sound, max_voices, priority)
+        return effect
+
+    def load(self, name, path, max_voices = 2, priority = 0, volume = None):
+        sound = pygame.mixer.Sound(path) if self.enabled else None
+        return self.add(name, sound, max_voices, priority, volume)
+
+    def play(self, name):
+        self.requested += 1
+        if name in self.pending:
+            self.coalesced += 1
+        else:
+            self.pending[name] = self.effects[name]
+
+    def active_voices(self):
+        # forget voices whose channel finished or was taken by someone else
+        for index, (effect, _) in list(self.voices.items()):
+            channel = self.channels[index]
+            if not channel.get_busy() or channel.get_sound() is not effect.sound:
+                del self.voices[index]
+        return self.voices
+
+    def start(self, index, effect):
+        self.channels[index].play(effect.sound)
+        self.voices[index] = (effect, self.order)
+        self.order += 1
+        self.played += 1
+
+    def dispatch(self, effect):
+        voices = self.voices
+        own = [index for index, (playing, _) in voices.items() if playing is effect]
+        if len(own) >= effect.max_voices:
+            self.restarted += 1
+            self.start(min(own, key = lambda index: voices[index][1]), effect)
+            return
+
+        for index in range(len(self.channels)):
+            if index not in voices:
+                self.start(index, effect)
+                return
+
+        candidates = [index for index, (playing, _) in voices.items() if playing.priority <= effect.priority]
+        if not candidates:
+            self.dropped += 1
+            return
+        self.stolen += 1
+        self.start(min(candidates, key = lambda index: (voices[index][0].priority, voices[index][1])), effect)
+
+    def update(self):
+        # once per frame: hand this frame's requests to the mixer
+        if self.pending and self.enabled:
+            self.active_voices()
+            for effect in sorted(self.pending.values(), key = lambda effect: -effect.priority):
+                self.dispatch(effect)
+            self.peak_voices = max(self.peak_voices, len(self.voices))
+        elif self.pending:
+            self.dropped += len(self.pending)
+        self.pending.clear()
+
+        now = time.perf_counter()
+        if now - self.window_start >= 1:
+            played, dropped = self.window_counts
+            elapsed = now - self.window_start
+            self.played_per_second = (self.played - played) / elapsed
+            self.dropped_per_second = (self.dropped - dropped) / elapsed
+            self.window_start = now
+            self.window_counts = (self.played, self.dropped)
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+        self.voices.clear()
+        self.pending.clear()
+
+    def play_music(self, path, volume = 1.0, loops = -1, fade_ms = 0):
+        # streamed, never decoded into memory as a whole
+        if not self.enabled:
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops, fade_ms = fade_ms)
+
+    def stop_music(self, fade_ms = 0):
+        if not self.enabled:
+            return
+        if fade_ms:
+            pygame.mixer.music.fadeout(fade_ms)
+        else:
+            pygame.mixer.music.stop()
+
+    def __str__(self):
+        return (f'audio: {self.requested} requests, {self.played} voices played, {self.coalesced} coalesced, '
+                f'{self.restarted} restarted, {self.stolen} stolen, {self.dropped} dropped, '
+                f'peak {self.peak_voices}/{len(self.channels)} channels; '
+                f'last second {self.played_per_second:.1f} played/s, {self.dropped_per_second:.1f} dropped/s')
@@ -0,0 +1,130 @@
+import numpy as np
+import pygame
+
+from common.spatial_hash import SpatialHash
+
+# World collision built once at map load. Tile layers become a solid-cell
+# bitmap and object-layer rectangles are bucketed in a spatial hash, so a
+# query only touches the cells a moving rect overlaps.
+
+class TileGrid:
+    def __init__(self, width, height, tile_size):
+        self.width, self.height = width, height
+        self.tile_size = tile_size
+        # numpy bitmap for batched lookups, nested lists for single-rect queries
+        self.solid = np.zeros((height, width), bool)
+        self.rows = self.solid.tolist()
+
+    @classmethod
+    def from_layers(cls, tmx_map, layer_names):
+        grid = cls(tmx_map.width, tmx_map.height, tmx_map.tilewidth)
+        for name in layer_names:
+            for x, y, gid in tmx_map.get_layer_by_name(name):
+                if gid:
+                    grid.solid[y, x] = True
+        grid.rows = grid.solid.tolist()
+        return grid
+
+    @classmethod
+    def rasterize(cls, rects, width, height, tile_size):
+        # marks every cell a rect overlaps, e.g. object-layer collisions for batched lookups
+        grid = cls(width, height, tile_size)
+        for rect in rects:
+            left, top, right, bottom = grid.cell_range(pygame.FRect(rect))
+            grid.solid[top:bottom + 1, left:right + 1] = True
+        grid.rows = grid.solid.tolist()
+        return grid
+
+    def set_solid(self, x, y, solid = True):
+        self.solid[y, x] = solid
+        self.rows[y][x] = solid
+
+    def cell_range(self, rect):
+        size = self.tile_size
+        left = max(0, int(rect.left // size))
+        top = max(0, int(rect.top // size))
+        # right/bottom edges are exclusive: a rect touching a tile does not overlap it
+        right = min(self.width - 1, int(-(-rect.right // size)) - 1)
+        bottom = min(self.height - 1, int(-(-rect.bottom // size)) - 1)
+        return left, top, right, bottom
+
+    def collide(self, rect):
+        left, top, right, bottom = self.cell_range(rect)
+        size = self.tile_size
+        hits = []
+        for y in range(top, bottom + 1):
+            row = self.rows[y]
+            for x in range(left, right + 1):
+                if row[x]:
+                    hits.append(pygame.FRect(x * size, y * size, size, size))
+        return hits
+
+    def any(self, rect):
+        left, top, right, bottom = self.cell_range(rect)
+        for y in range(top, bottom + 1):
+            if any(self.rows[y][left:right + 1]):
+                return True
+        return False
+
+class CollisionRect:
+    __slots__ = ('rect', 'name')
+
+    def __init__(self, rect, name = None):
+        self.rect = pygame.FRect(rect)
+        self.name = name
+
+class RectIndex:
+    def __init__(self, cell_size = 128):
+        self.hash = SpatialHash(cell_size)
+
+    def __len__(self):
+        return len(self.hash)
+
+    @classmethod
+    def from_objects(cls, objects, cell_size = 128):
+        index = cls(cell_size)
+        for obj in objects:
+            index.add((obj.x, obj.y, obj.width, obj.height), obj.name)
+        return index
+
+    def add(self, rect, name = None):
+        item = CollisionRect(rect, name)
+        self.hash.insert(item)
+        return item
+
+    def remove(self, item):
+        self.hash.remove(item)
+
+    def collide(self, rect):
+        return [item.rect for item in self.hash.query(rect)]
+
+    def all_rects(self):
+        return [item.rect for item in self.hash.sprite_cells]
+
+    def any(self, rect):
+        return bool(self.hash.query(rect))
+
+class CollisionIndex:
+    def __init__(self, grid = None, rects = None):
+        self.grid = grid
+        self.rects = rects
+
+    @classmethod
+    def from_tmx(cls, tmx_map, tile_layers = (), object_layers = (), cell_size = 128):
+        grid = TileGrid.from_layers(tmx_map, tile_layers) if tile_layers else None
+        rects = None
+        if object_layers:
+            objects = [obj for name in object_layers for obj in tmx_map.get_layer_by_name(name)]
+            rects = RectIndex.from_objects(objects, cell_size)
+        return cls(grid, rects)
+
+    def collide(self, rect):
+        hits = []
+        if self.grid:
+            hits.extend(self.grid.collide(rect))
+        if self.rects:
+            hits.extend(self.rects.collide(rect))
+        return hits
+
+    def any(self, rect):
+        return bool((self.grid and self.grid.any(rect)) or (self.rects and self.rects.any(rect)))
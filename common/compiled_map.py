@@ -0,0 +1,302 @@
+import json
+import os
+import struct
+import sys
+import xml.etree.ElementTree as ElementTree
+from os.path import abspath, dirname, exists, getmtime, join, normpath, relpath, splitext
+
+import numpy as np
+import pygame
+
+# TMX maps compiled into one file that loads without XML, CSV or per-tile
+# image work:
+#
+#     [magic, version, header size] [JSON header] [arrays, 64-byte aligned]
+#
+# The header holds the map properties, the layer order, the string table,
+# the tileset images and where each array starts. The arrays are NumPy tile
+# layers (uint32 gids, rows x columns), the object table of every object
+# layer, the deduplicated image regions (image, rect and Tiled's flip flags)
+# and the region of every gid. They are opened as
+# read-only memory maps at their offsets, the single-file equivalent of
+# np.load(mmap_mode = 'r').
+#
+# Build step:  python -m common.compiled_map <map.tmx> [<map.tmx> ...]
+# writes <map>.tmxc next to each map. load_map() uses that file while it is
+# newer than the TMX, its tilesets and their images, and recompiles it
+# otherwise. The loaded map answers the same calls as a pytmx map
+# (get_layer_by_name, layer iteration and tiles(), object x/y/width/height/
+# name/image, images[gid]), so it drops in for load_pygame.
+
+MAGIC = b'TMXC'
+VERSION = 1
+HEADER = struct.Struct('<4sIQ')
+ALIGNMENT = 64
+
+OBJECT_DTYPE = np.dtype([
+    ('layer', '<u2'), ('name', '<u4'), ('type', '<u4'), ('id', '<u4'), ('gid', '<u4'),
+    ('x', '<f8'), ('y', '<f8'), ('width', '<f8'), ('height', '<f8'), ('rotation', '<f8'), ('visible', 'u1'),
+])
+# region columns: image index, x, y, width, height (-1: the whole image), flip flags
+TILE_COLUMNS = 6
+FLIP_HORIZONTAL, FLIP_VERTICAL, FLIP_DIAGONAL = 1, 2, 4
+
+def compiled_path(tmx_path):
+    return splitext(tmx_path)[0] + '.tmxc'
+
+def tileset_sources(tmx_path):
+    # external .tsx files referenced by the map
+    folder = dirname(tmx_path)
+    root = ElementTree.parse(tmx_path).getroot()
+    return [normpath(join(folder, tileset.get('source'))) for tileset in root.iter('tileset') if tileset.get('source')]
+
+def compile_map(tmx_path, output_path = None):
+    import pytmx
+
+    output_path = output_path or compiled_path(tmx_path)
+    base = dirname(abspath(output_path))
+    images = {}
+    regions = {}
+
+    # pytmx calls the image loader for every gid it uses; recording the
+    # requests instead of cutting surfaces gives the gid -> region table
+    def recording_loader(filename, colorkey, **kwargs):
+        image = images.setdefault((relpath(abspath(filename), base).replace(os.sep, '/'), colorkey), len(images))
+
+        def load(rect = None, flags = None):
+            flip = 0
+            if flags:
+                flip = (FLIP_HORIZONTAL * flags.flipped_horizontally + FLIP_VERTICAL * flags.flipped_vertically +
+                        FLIP_DIAGONAL * flags.flipped_diagonally)
+            region = (image, *(rect or (0, 0, -1, -1)), flip)
+            return regions.setdefault(region, len(regions) + 1)
+        return load
+
+    tmx = pytmx.TiledMap(tmx_path, image_loader = recording_loader)
+
+    # region 0 is "no image"; every gid points at one region, shared by
+    # all gids that show the same part of the same image
+    region_table = np.zeros((len(regions) + 1, TILE_COLUMNS), np.int32)
+    for region, index in regions.items():
+        region_table[index] = region
+    gid_regions = np.array([region or 0 for region in tmx.images], np.uint32)
+
+    strings = {'': 0}
+    def string(value):
+        return strings.setdefault(value or '', len(strings))
+
+    layers = []
+    arrays = {'regions': region_table, 'gids': gid_regions}
+    objects = []
+    for layer in tmx.layers:
+        entry = {'name': layer.name, 'visible': bool(layer.visible), 'opacity': float(layer.opacity),
+                 'offset': [float(getattr(layer, 'offsetx', 0)), float(getattr(layer, 'offsety', 0))],
+                 'properties': layer.properties}
+        if isinstance(layer, pytmx.TiledTileLayer):
+            entry['kind'] = 'tiles'
+            entry['array'] = f'layer{len(layers)}'
+            arrays[entry['array']] = np.array(layer.data, np.uint32).reshape(layer.height, layer.width)
+        elif isinstance(layer, pytmx.TiledObjectGroup):
+            entry['kind'] = 'objects'
+            entry['properties'] = layer.properties
+            entry['object_properties'] = {}
+            for obj in layer:
+                if obj.properties:
+                    entry['object_properties'][len(objects)] = obj.properties
+                if getattr(obj, 'points', None):
+                    entry.setdefault('points', {})[len(objects)] = [list(point) for point in obj.points]
+                objects.append((len(layers), string(obj.name), string(getattr(obj, 'type', None)), obj.id, obj.gid or 0,
+                                obj.x, obj.y, obj.width, obj.height, getattr(obj, 'rotation', 0), getattr(obj, 'visible', 1)))
+        else:
+            # image layers and groups are not compiled
+            continue
+        layers.append(entry)
+    arrays['objects'] = np.array(objects, OBJECT_DTYPE)
+
+    sources = [tmx_path, *tileset_sources(tmx_path)]
+    sources += [join(base, path) for path, _ in images]
+    header = {
+        'width': tmx.width, 'height': tmx.height, 'tilewidth': tmx.tilewidth, 'tileheight': tmx.tileheight,
+        'properties': tmx.properties,
+        'sources': [relpath(abspath(path), base).replace(os.sep, '/') for path in sources],
+        'images': [{'path': path, 'colorkey': colorkey} for path, colorkey in images],
+        'strings': list(strings),
+        'layers': layers,
+        'arrays': {},
+    }
+
+    # array offsets depend on the header size, so settle the header first
+    offset = 0
+    for name, array in arrays.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        header['arrays'][name] = {'dtype': array.dtype.descr if array.dtype.names else array.dtype.str,
+                                  'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+    header_bytes = json.dumps(header, separators = (',', ':'), default = str).encode()
+    data_start = -(-(HEADER.size + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+
+    temp_path = f'{output_path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for name, array in arrays.items():
+            file.seek(data_start + header['arrays'][name]['offset'])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.truncate(data_start + offset)
+    os.replace(temp_path, output_path)
+    return output_path
+
+def is_stale(path):
+    # missing, or older than any file it was compiled from
+    if not exists(path):
+        return True
+    try:
+        with open(path, 'rb') as file:
+            magic, version, header_size = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                return True
+            sources = json.loads(file.read(header_size))['sources']
+    except (OSError, ValueError, struct.error):
+        return True
+    base = dirname(abspath(path))
+    compiled_time = getmtime(path)
+    return any(not exists(join(base, source)) or getmtime(join(base, source)) > compiled_time for source in sources)
+
+class MapObject:
+    __slots__ = ('id', 'name', 'type', 'x', 'y', 'width', 'height', 'rotation', 'visible', 'gid', 'image',
+                 'properties', 'points')
+
+    def __init__(self, row, strings, image, properties, points):
+        self.id = int(row['id'])
+        self.name = strings[row['name']] or None
+        self.type = strings[row['type']] or None
+        self.x, self.y = float(row['x']), float(row['y'])
+        self.width, self.height = float(row['width']), float(row['height'])
+        self.rotation = float(row['rotation'])
+        self.visible = bool(row['visible'])
+        self.gid = int(row['gid'])
+        self.image = image
+        self.properties = properties
+        self.points = points
+
+class TileLayer:
+    def __init__(self, tiled_map, info, data):
+        self.map = tiled_map
+        self.name = info['name']
+        self.visible = info['visible']
+        self.opacity = info['opacity']
+        self.properties = info['properties']
+        self.data = data
+        self.height, self.width = data.shape
+
+    def __iter__(self):
+        # (x, y, gid) for every cell, like pytmx
+        for y, row in enumerate(self.data.tolist()):
+            for x, gid in enumerate(row):
+                yield x, y, gid
+
+    def tiles(self):
+        # (x, y, image) for every cell with a tile
+        images = self.map.images
+        ys, xs = np.nonzero(self.data)
+        for x, y, gid in zip(xs.tolist(), ys.tolist(), self.data[ys, xs].tolist()):
+            image = images[gid]
+            if image:
+                yield x, y, image
+
+class ObjectLayer(list):
+    def __init__(self, info, objects):
+        super().__init__(objects)
+        self.name = info['name']
+        self.visible = info['visible']
+        self.opacity = info['opacity']
+        self.properties = info['properties']
+
+class CompiledMap:
+    def __init__(self, path, load_images = True):
+        self.path = path
+        with open(path, 'rb') as file:
+            magic, version, header_size = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'{path} is not a version {VERSION} compiled map')
+            header = json.loads(file.read(header_size))
+        self.header = header
+        self.width, self.height = header['width'], header['height']
+        self.tilewidth, self.tileheight = header['tilewidth'], header['tileheight']
+        self.properties = header['properties']
+
+        data_start = -(-(HEADER.size + header_size) // ALIGNMENT) * ALIGNMENT
+        self.arrays = {}
+        for name, info in header['arrays'].items():
+            dtype = np.dtype([tuple(field) for field in info['dtype']] if isinstance(info['dtype'], list) else info['dtype'])
+            shape = tuple(info['shape'])
+            if 0 in shape:
+                self.arrays[name] = np.zeros(shape, dtype)
+            else:
+                self.arrays[name] = np.memmap(path, dtype, 'r', data_start + info['offset'], shape)
+        self.gid_regions = self.arrays['gids']
+        self.images = self.load_images() if load_images else [None] * len(self.gid_regions)
+
+        strings = header['strings']
+        objects = self.arrays['objects']
+        self.layers = []
+        self.layer_names = {}
+        for index, info in enumerate(header['layers']):
+            if info['kind'] == 'tiles':
+                layer = TileLayer(self, info, self.arrays[info['array']])
+            else:
+                rows = np.flatnonzero(objects['layer'] == index).tolist()
+                object_properties, points = info['object_properties'], info.get('points', {})
+                layer = ObjectLayer(info, (
+                    MapObject(objects[row], strings, self.images[objects[row]['gid']] if objects[row]['gid'] else None,
+                              object_properties.get(str(row), {}), points.get(str(row)))
+                    for row in rows))
+            self.layers.append(layer)
+            self.layer_names[layer.name] = layer
+
+    def load_images(self):
+        # each tileset image is decoded once, tiles are regions of it
+        base = dirname(abspath(self.path))
+        converted = pygame.display.get_surface() is not None
+        sources = []
+        for image in self.header['images']:
+            surface = pygame.image.load(join(base, image['path']))
+            if image['colorkey']:
+                surface.set_colorkey(pygame.Color(f"#{image['colorkey'].lstrip('#')}"))
+                surface = surface.convert() if converted else surface
+            elif converted:
+                surface = surface.convert_alpha()
+            sources.append(surface)
+
+        surfaces = [None]
+        for image, x, y, width, height, flip in self.arrays['regions'].tolist()[1:]:
+            surface = sources[image] if width < 0 else sources[image].subsurface((x, y, width, height))
+            if flip & FLIP_DIAGONAL:
+                surface = pygame.transform.flip(pygame.transform.rotate(surface, 270), True, False)
+            if flip & (FLIP_HORIZONTAL | FLIP_VERTICAL):
+                surface = pygame.transform.flip(surface, bool(flip & FLIP_HORIZONTAL), bool(flip & FLIP_VERTICAL))
+            surfaces.append(surface)
+        return [surfaces[region] for region in self.gid_regions.tolist()]
+
+    def get_layer_by_name(self, name):
+        return self.layer_names[name]
+
+    @property
+    def objects(self):
+        return [obj for layer in self.layers if isinstance(layer, ObjectLayer) for obj in layer]
+
+def load_map(tmx_path, load_images = True):
+    # compiled map for tmx_path, recompiled first when it is missing or stale
+    path = compiled_path(tmx_path)
+    if is_stale(path):
+        compile_map(tmx_path, path)
+    return CompiledMap(path, load_images)
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit('usage: python -m common.compiled_map <map.tmx> [<map.tmx> ...]')
+    for tmx_path in sys.argv[1:]:
+        path = compile_map(tmx_path)
+        tiled_map = CompiledMap(path, load_images = False)
+        print(f'{path}: {len(tiled_map.layers)} layers, {len(tiled_map.arrays["objects"])} objects, '
+              f'{len(tiled_map.header["images"])} images, {os.path.getsize(path)} bytes')
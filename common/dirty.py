@@ -0,0 +1,85 @@
+import pygame
+
+# Optional dirty-rectangle rendering. Instead of clearing and pushing the whole
+# window every frame, only the background under last frame's sprites is
+# restored and only the changed rects go to pygame.display.update.
+#
+#     renderer = DirtyRenderer(screen, background)
+#     renderer.clear()
+#     renderer.draw(all_sprites)          # any group whose draw returns rects
+#     renderer.mark(score_rect)           # anything drawn by hand
+#     renderer.update()
+#
+# With enabled=False the same calls do a full clear and a full update, so a
+# game can switch modes at runtime with toggle().
+
+class DirtyRenderer:
+    def __init__(self, surface, background, enabled = True):
+        self.surface = surface
+        self.background = background
+        self.enabled = enabled
+        self.screen_rect = surface.get_rect()
+
+        self.previous = []
+        self.current = []
+        self.full_redraw = True
+
+        # fraction of window pixels pushed to the display
+        self.frames = 0
+        self.pushed_total = 0.0
+        self.last_fraction = 1.0
+
+    def set_background(self, background):
+        self.background = background
+        self.full_redraw = True
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.full_redraw = True
+
+    def clear(self):
+        if self.enabled and not self.full_redraw:
+            background, surface = self.background, self.surface
+            surface.blits([(background, rect, rect) for rect in self.previous], doreturn = False)
+        else:
+            self.surface.blit(self.background, (0, 0))
+
+    def mark(self, rect):
+        if rect is None:
+            return
+        # 1px margin: float positions may land on either side when blitted
+        rect = pygame.Rect(rect).inflate(2, 2).clip(self.screen_rect)
+        if rect:
+            self.current.append(rect)
+
+    def draw(self, group, *args, **kwargs):
+        rects = group.draw(self.surface, *args, **kwargs) or []
+        for rect in rects:
+            self.mark(rect)
+        return rects
+
+    def update(self):
+        area = self.screen_rect.width * self.screen_rect.height
+        if self.enabled and not self.full_redraw:
+            rects = self.previous + self.current
+            pygame.display.update(rects)
+            # overlapping rects are counted twice, so this is an upper bound
+            fraction = min(1.0, sum(rect.width * rect.height for rect in rects) / area)
+        else:
+            pygame.display.update()
+            fraction = 1.0
+            self.full_redraw = False
+
+        self.previous, self.current = self.current, []
+        self.frames += 1
+        self.pushed_total += fraction
+        self.last_fraction = fraction
+
+    @property
+    def mean_fraction(self):
+        return self.pushed_total / self.frames if self.frames else 0.0
+
+    def __str__(self):
+        mode = 'dirty rects' if self.enabled else 'full redraw'
+        return (f'render: {mode}, {self.mean_fraction * 100:.1f}% of the window pushed per frame '
+                f'over {self.frames} frames (last {self.last_fraction * 100:.1f}%)')
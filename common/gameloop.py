@@ -0,0 +1,98 @@
+import pygame
+
+# Fixed-timestep simulation with interpolated rendering.
+#
+# Real frame time is fed into an accumulator and the simulation advances in
+# whole steps of `step` seconds, so game logic is identical at any display
+# rate. `alpha` is how far the renderer is between the last two simulation
+# states. At most `max_steps` run per frame; time beyond that is dropped
+# (spiral-of-death protection) and counted in `dropped_time`.
+#
+#     loop = FixedTimestep(1 / 60)
+#     while running:
+#         for _ in loop.tick(clock):
+#             all_sprites.snapshot()
+#             all_sprites.update(loop.step)
+#         all_sprites.draw(screen, loop.alpha)
+#
+# time_scale > 1 runs the simulation faster than real time; unlocked=True
+# ignores the clock completely and runs steps_per_frame steps every frame as
+# fast as possible, which is deterministic and handy for tests.
+
+class FixedTimestep:
+    def __init__(self, step = 1 / 60, max_steps = 5, time_scale = 1.0, unlocked = False, steps_per_frame = 1):
+        self.step = step
+        self.max_steps = max_steps
+        self.time_scale = time_scale
+        self.unlocked = unlocked
+        self.steps_per_frame = steps_per_frame
+
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.steps_run = 0
+        self.dropped_time = 0.0
+
+    @property
+    def time(self):
+        # simulated seconds since the loop started
+        return self.steps_run * self.step
+
+    def advance(self, frame_time):
+        if self.unlocked:
+            # no leftover time: draw the state the last step produced
+            steps = self.steps_per_frame
+            self.alpha = 1.0
+        else:
+            self.accumulator += frame_time * self.time_scale
+            # tiny epsilon so a frame of exactly one step never rounds down to zero
+            steps = int((self.accumulator + 1e-9) // self.step)
+            if steps > self.max_steps:
+                self.dropped_time += (steps - self.max_steps) * self.step
+                self.accumulator -= (steps - self.max_steps) * self.step
+                steps = self.max_steps
+            self.accumulator = max(0.0, self.accumulator - steps * self.step)
+            self.alpha = min(1.0, self.accumulator / self.step)
+        self.steps_run += steps
+        return steps
+
+    def tick(self, clock, framerate = 0):
+        # unlocked loops never sleep in clock.tick
+        frame_time = clock.tick(0 if self.unlocked else framerate) / 1000
+        return range(self.advance(frame_time))
+
+def lerp(previous, current, alpha):
+    return previous + (current - previous) * alpha
+
+class InterpolatedGroup(pygame.sprite.Group):
+    # Draws each sprite between its centre at the previous simulation step and
+    # its current one (centres, so sprites whose image changes size such as
+    # rotating meteors do not wobble). Call snapshot() before every update step.
+    def __init__(self, *sprites):
+        self.previous = {}
+        super().__init__(*sprites)
+
+    def remove_internal(self, sprite):
+        # a pooled sprite can be killed and re-added within one step; without
+        # its old centre it is drawn where it is now instead of sliding there
+        super().remove_internal(sprite)
+        self.previous.pop(sprite, None)
+
+    def snapshot(self):
+        self.previous = {sprite: sprite.rect.center for sprite in self.sprites()}
+
+    def draw(self, surface, alpha = 1.0, special_flags = 0):
+        # returns the drawn rects, like Group.draw
+        blits = []
+        rects = []
+        previous = self.previous
+        for sprite in self.sprites():
+            image, rect = sprite.image, sprite.rect
+            if alpha < 1 and sprite in previous:
+                (px, py), (x, y) = previous[sprite], rect.center
+                pos = px + (x - px) * alpha - rect.width / 2, py + (y - py) * alpha - rect.height / 2
+            else:
+                pos = rect.topleft
+            blits.append((image, pos))
+            rects.append(pygame.Rect(pos, image.get_size()))
+        surface.fblits(blits, special_flags)
+        return rects
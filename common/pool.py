@@ -0,0 +1,95 @@
+import gc
+from time import perf_counter
+
+import pygame
+
+# Object pools for short-lived game objects. acquire() hands back a released
+# object re-initialised through its reset() method (same arguments as the
+# constructor) and only constructs a new one when the pool is empty.
+
+class Pool:
+    def __init__(self, factory, name = None):
+        self.factory = factory
+        self.name = name or getattr(factory, '__name__', 'pool')
+        self.free = []
+
+        # allocation counters
+        self.created = 0
+        self.acquired = 0
+        self.released = 0
+
+    def acquire(self, *args, **kwargs):
+        self.acquired += 1
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            return obj
+        self.created += 1
+        obj = self.factory(*args, **kwargs)
+        obj.pool = self
+        return obj
+
+    def release(self, obj):
+        self.released += 1
+        self.free.append(obj)
+
+    @property
+    def in_use(self):
+        return self.created - len(self.free)
+
+    def __str__(self):
+        reused = self.acquired - self.created
+        return (f'{self.name} pool: {self.acquired} acquired, {self.created} constructed, '
+                f'{reused} reused, {self.in_use} in use, {len(self.free)} free')
+
+_masks = {}
+
+def shared_mask(surf):
+    # one mask per surface, shared by every sprite that shows it
+    mask = _masks.get(surf)
+    if mask is None:
+        mask = _masks[surf] = pygame.mask.from_surface(surf)
+    return mask
+
+class PooledSprite(pygame.sprite.Sprite):
+    # kill() hands the sprite back to its pool instead of leaving it for the GC
+    def kill(self):
+        if self.alive():
+            super().kill()
+            pool = getattr(self, 'pool', None)
+            if pool:
+                pool.release(self)
+
+class GCMonitor:
+    # times every garbage collection through gc.callbacks
+    def __init__(self):
+        self.pauses = {0: [], 1: [], 2: []}
+        self.started = 0.0
+        gc.callbacks.append(self.callback)
+
+    def callback(self, phase, info):
+        if phase == 'start':
+            self.started = perf_counter()
+        else:
+            self.pauses[info['generation']].append(perf_counter() - self.started)
+
+    def stop(self):
+        if self.callback in gc.callbacks:
+            gc.callbacks.remove(self.callback)
+
+    @property
+    def collections(self):
+        return sum(len(pauses) for pauses in self.pauses.values())
+
+    @property
+    def total(self):
+        return sum(sum(pauses) for pauses in self.pauses.values())
+
+    @property
+    def longest(self):
+        return max((max(pauses) for pauses in self.pauses.values() if pauses), default = 0.0)
+
+    def __str__(self):
+        per_generation = ', '.join(f'gen{generation}: {len(pauses)}' for generation, pauses in self.pauses.items())
+        return (f'gc: {self.collections} collections ({per_generation}), '
+                f'{self.total * 1000:.2f} ms total, longest pause {self.longest * 1000:.2f} ms')
@@ -0,0 +1,161 @@
+import json
+import time
+from collections import deque
+from time import perf_counter_ns
+
+import pygame
+
+# Frame profiler. Game code wraps phases in named spans:
+#
+#     with profiler.span('collisions'):
+#         collisions()
+#     ...
+#     profiler.end_frame()
+#
+# Spans go into a ring buffer. F3 switches profiling on with an overlay
+# (frame-time graph plus the last frame's span breakdown) and F4 writes the
+# last `seconds` of spans as a Chrome trace-event file (chrome://tracing or
+# ui.perfetto.dev). While disabled span() hands back one shared no-op
+# context manager, so instrumented code pays a method call and nothing else.
+
+TOGGLE_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+OVERLAY_WIDTH = 300
+GRAPH_HEIGHT = 80
+GRAPH_MAX_MS = 50
+PANEL_REFRESH_FRAMES = 6
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, perf_counter_ns())
+        return False
+
+class Profiler:
+    def __init__(self, enabled = False, seconds = 10, max_events = 200_000, history = OVERLAY_WIDTH - 20):
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self.seconds = seconds
+
+        # (name, start ns, end ns), oldest first
+        self.events = deque(maxlen = max_events)
+        self.frame_times = deque(maxlen = history)
+        self.frame_spans = {}
+        self.last_spans = {}
+        self.frame_start = None
+
+        self.font = None
+        self.panel = None
+        self.panel_age = 0
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def record(self, name, start, end):
+        self.events.append((name, start, end))
+        self.frame_spans[name] = self.frame_spans.get(name, 0) + end - start
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        if self.frame_start is not None:
+            self.events.append(('frame', self.frame_start, now))
+            self.frame_times.append((now - self.frame_start) / 1e6)
+        self.frame_start = now
+        self.last_spans, self.frame_spans = self.frame_spans, {}
+
+    def toggle(self):
+        self.enabled = self.show_overlay = not self.enabled
+        self.frame_start = None
+        self.frame_spans = {}
+        self.panel = None
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == TOGGLE_KEY:
+                self.toggle()
+            elif event.key == DUMP_KEY:
+                print(f'trace written to {self.dump()}')
+
+    def trace(self, seconds = None):
+        seconds = self.seconds if seconds is None else seconds
+        if not self.events:
+            return {'traceEvents': []}
+        newest = max(end for _, _, end in self.events)
+        oldest = newest - seconds * 1_000_000_000
+        return {
+            'traceEvents': [
+                {'name': name, 'ph': 'X', 'pid': 0, 'tid': 0, 'ts': start / 1000, 'dur': (end - start) / 1000}
+                for name, start, end in self.events if end >= oldest
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def dump(self, path = None, seconds = None):
+        path = path or time.strftime('trace-%Y%m%d-%H%M%S.json')
+        with open(path, 'w') as file:
+            json.dump(self.trace(seconds), file)
+        return path
+
+    def build_panel(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        lines = []
+        if self.frame_times:
+            times = sorted(self.frame_times)
+            lines.append(f'frame {self.frame_times[-1]:.2f} ms  p95 {times[int(len(times) * 0.95)]:.2f}  max {times[-1]:.2f}')
+        for name, total in self.last_spans.items():
+            lines.append(f'{name:<14} {total / 1e6:6.2f} ms')
+
+        line_height = self.font.get_linesize()
+        panel = pygame.Surface((OVERLAY_WIDTH, GRAPH_HEIGHT + 20 + line_height * len(lines)), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+
+        # frame-time graph with the 60 fps budget marked
+        bottom = GRAPH_HEIGHT + 10
+        budget = bottom - GRAPH_HEIGHT * (1000 / 60) / GRAPH_MAX_MS
+        pygame.draw.line(panel, (90, 90, 90), (10, budget), (OVERLAY_WIDTH - 10, budget))
+        for x, frame_time in enumerate(self.frame_times, 10):
+            height = min(GRAPH_HEIGHT, GRAPH_HEIGHT * frame_time / GRAPH_MAX_MS)
+            color = (90, 220, 90) if frame_time <= 1000 / 60 else (230, 70, 50)
+            pygame.draw.line(panel, color, (x, bottom), (x, bottom - height))
+
+        for index, line in enumerate(lines):
+            panel.blit(self.font.render(line, True, 'white'), (10, bottom + 5 + index * line_height))
+        return panel
+
+    def draw(self, surface, pos = (10, 10)):
+        # returns the rect drawn, for dirty-rect renderers
+        if not (self.enabled and self.show_overlay):
+            return None
+        self.panel_age -= 1
+        if self.panel is None or self.panel_age <= 0:
+            self.panel = self.build_panel()
+            self.panel_age = PANEL_REFRESH_FRAMES
+        return surface.blit(self.panel, pos)
+
+# shared profiler for games that only need one
+profiler = Profiler()
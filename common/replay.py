@@ -0,0 +1,194 @@
+import hashlib
+import random
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+# Input replays. A recording is the RNG seed plus the state of the keys the
+# game reads at every simulation step, so replaying it reproduces the session
+# exactly (as long as game logic only depends on the seed, the keys and the
+# step count). Key state is a bitmask over the recorded keys, delta encoded:
+# the stream holds (steps since the last change, changed bits) varint pairs,
+# zlib compressed, so a held key costs nothing per step and minutes of play
+# fit in a few kilobytes. The game's final state hash is stored with it.
+#
+#     session = replay_session((pygame.K_LEFT, pygame.K_RIGHT))   # --record / --replay
+#     loop = FixedTimestep(step, unlocked = session.playing)
+#     while running:
+#         for _ in loop.tick(clock):
+#             keys = session.step(pygame.key.get_pressed())
+#             running = running and not session.finished
+#             ...
+#     session.finish(state_hash(score, player.rect.center))
+#
+# Playback reads no keyboard state and should run with an unlocked loop (no
+# clock cap), which turns a recorded run into a reproducible load test.
+
+MAGIC = b'PGRP'
+VERSION = 1
+# magic, version, seed, steps, key count, hash length
+HEADER = struct.Struct('<4sBQIBB')
+
+def state_hash(*values):
+    # short digest of plain values (numbers, strings and tuples/lists of them)
+    return hashlib.blake2b(repr(values).encode(), digest_size = 8).hexdigest()
+
+def encode_varint(value, out):
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varints(data):
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+def seed_everything(seed):
+    random.seed(seed)
+    np.random.seed(seed & 0xffffffff)
+
+class ReplayKeys:
+    # stands in for pygame.key.get_pressed() during playback
+    __slots__ = ('bits', 'mask')
+
+    def __init__(self, bits, mask):
+        self.bits = bits
+        self.mask = mask
+
+    def __getitem__(self, key):
+        bit = self.bits.get(key)
+        return bit is not None and bool(self.mask >> bit & 1)
+
+class LiveSession:
+    # plain play: keys pass straight through, nothing is recorded
+    playing = False
+    recording = False
+    finished = False
+
+    def __init__(self, keys, seed = None):
+        self.keys = tuple(keys)
+        self.seed = seed
+        self.steps = 0
+        if seed is not None:
+            seed_everything(seed)
+
+    def step(self, pressed):
+        self.steps += 1
+        return pressed
+
+    def finish(self, final_hash):
+        return True
+
+class Recorder(LiveSession):
+    recording = True
+
+    def __init__(self, path, keys, seed = None):
+        super().__init__(keys, random.getrandbits(63) if seed is None else seed)
+        self.path = path
+        self.mask = 0
+        self.last_change = 0
+        self.stream = bytearray()
+
+    def step(self, pressed):
+        mask = 0
+        for bit, key in enumerate(self.keys):
+            if pressed[key]:
+                mask |= 1 << bit
+        if mask != self.mask:
+            encode_varint(self.steps - self.last_change, self.stream)
+            encode_varint(mask ^ self.mask, self.stream)
+            self.mask, self.last_change = mask, self.steps
+        self.steps += 1
+        return pressed
+
+    def save(self, final_hash):
+        # returns the file size
+        digest = final_hash.encode()
+        data = b''.join((
+            HEADER.pack(MAGIC, VERSION, self.seed, self.steps, len(self.keys), len(digest)),
+            struct.pack(f'<{len(self.keys)}I', *self.keys),
+            digest,
+            zlib.compress(bytes(self.stream), 9),
+        ))
+        with open(self.path, 'wb') as file:
+            file.write(data)
+        return len(data)
+
+    def finish(self, final_hash):
+        size = self.save(final_hash)
+        print(f'replay: recorded {self.steps} steps to {self.path} ({size} bytes), state {final_hash}')
+        return True
+
+class Player(LiveSession):
+    playing = True
+
+    def __init__(self, path, keys = None):
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, seed, steps, key_count, hash_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} replay')
+        offset = HEADER.size
+        recorded_keys = struct.unpack_from(f'<{key_count}I', data, offset)
+        offset += 4 * key_count
+        if keys is not None and tuple(keys) != recorded_keys:
+            raise ValueError(f'{path} was recorded with different keys')
+        super().__init__(recorded_keys, seed)
+        self.path = path
+        self.total_steps = steps
+        self.expected_hash = data[offset:offset + hash_length].decode()
+
+        # expand the change list into (step, mask) pairs, consumed in order
+        values = decode_varints(zlib.decompress(data[offset + hash_length:]))
+        self.changes = []
+        step = mask = 0
+        for gap, flipped in zip(values[::2], values[1::2]):
+            step += gap
+            mask ^= flipped
+            self.changes.append((step, mask))
+        self.changes.reverse()
+        self.keys_state = ReplayKeys({key: bit for bit, key in enumerate(recorded_keys)}, 0)
+        self.start = None
+
+    @property
+    def finished(self):
+        return self.steps >= self.total_steps
+
+    def step(self, pressed = None):
+        if self.start is None:
+            self.start = time.perf_counter()
+        changes = self.changes
+        while changes and changes[-1][0] <= self.steps:
+            self.keys_state.mask = changes.pop()[1]
+        self.steps += 1
+        return self.keys_state
+
+    def finish(self, final_hash):
+        elapsed = time.perf_counter() - (self.start or time.perf_counter())
+        rate = f'{self.steps / elapsed:,.0f} steps/s' if elapsed > 0 else 'instant'
+        ok = self.steps == self.total_steps and final_hash == self.expected_hash
+        result = 'OK' if ok else f'MISMATCH (expected {self.expected_hash} after {self.total_steps} steps)'
+        print(f'replay: {self.steps} steps in {elapsed:.2f} s ({rate}), state {final_hash} {result}')
+        return ok
+
+def replay_session(keys, argv = None):
+    # --record PATH records this session, --replay PATH plays one back
+    argv = sys.argv if argv is None else argv
+    for flag, session in (('--record', Recorder), ('--replay', Player)):
+        if flag in argv:
+            index = argv.index(flag)
+            if index + 1 >= len(argv):
+                raise SystemExit(f'{flag} needs a file name')
+            return session(argv[index + 1], keys)
+    return LiveSession(keys)
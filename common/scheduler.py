@@ -0,0 +1,110 @@
+import heapq
+from itertools import count
+
+# Central timer scheduler. Calls wait in a min-heap keyed on their deadline,
+# so a frame only touches the calls that are actually due instead of polling
+# every timer. Time is game time in milliseconds from a GameClock, which the
+# game advances (usually once per fixed simulation step) and which can be
+# paused or scaled.
+#
+#     call = scheduler.schedule(2000, meteor.kill)
+#     call.cancel()
+#     scheduler.update(step_ms)
+
+class GameClock:
+    def __init__(self, time_scale = 1.0):
+        self.time = 0.0
+        self.time_scale = time_scale
+        self.paused = False
+
+    def advance(self, dt):
+        if not self.paused:
+            self.time += dt * self.time_scale
+        return self.time
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+class ScheduledCall:
+    __slots__ = ('deadline', 'interval', 'func', 'repeat', 'cancelled', 'scheduler')
+
+    def __init__(self, scheduler, deadline, interval, func, repeat):
+        self.scheduler = scheduler
+        self.deadline = deadline
+        self.interval = interval
+        self.func = func
+        self.repeat = repeat
+        self.cancelled = False
+
+    @property
+    def active(self):
+        return not self.cancelled and self.deadline is not None
+
+    @property
+    def remaining(self):
+        return max(0.0, self.deadline - self.scheduler.now) if self.active else 0.0
+
+    def cancel(self):
+        if self.active:
+            self.cancelled = True
+            self.scheduler.cancelled += 1
+
+class Scheduler:
+    def __init__(self, clock = None):
+        self.clock = clock or GameClock()
+        self.heap = []
+        self.order = count()
+        # cancelled calls stay in the heap until popped or compacted
+        self.cancelled = 0
+        self.fired = 0
+
+    def __len__(self):
+        return len(self.heap) - self.cancelled
+
+    @property
+    def now(self):
+        return self.clock.time
+
+    def schedule(self, delay, func, repeat = False):
+        if repeat and delay <= 0:
+            raise ValueError('repeating calls need a positive delay')
+        call = ScheduledCall(self, self.now + delay, delay, func, repeat)
+        heapq.heappush(self.heap, (call.deadline, next(self.order), call))
+        return call
+
+    def update(self, dt = 0):
+        now = self.clock.advance(dt)
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            deadline, _, call = heapq.heappop(heap)
+            if call.cancelled:
+                self.cancelled -= 1
+                continue
+            if call.repeat:
+                # next deadline follows the previous one, so repeats do not drift
+                call.deadline = deadline + call.interval
+                heapq.heappush(heap, (call.deadline, next(self.order), call))
+            else:
+                call.deadline = None
+            self.fired += 1
+            call.func()
+
+        if self.cancelled > 64 and self.cancelled > len(heap) // 2:
+            self.compact()
+
+    def compact(self):
+        self.heap = [entry for entry in self.heap if not entry[2].cancelled]
+        heapq.heapify(self.heap)
+        self.cancelled = 0
+
+    def clear(self):
+        for _, _, call in self.heap:
+            call.cancelled = True
+        self.heap.clear()
+        self.cancelled = 0
+
+# shared scheduler for games that only need one
+scheduler = Scheduler()
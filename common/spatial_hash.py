@@ -0,0 +1,77 @@
+from collections import defaultdict
+
+class SpatialHash:
+    # Uniform grid broad-phase. Sprites are bucketed by the cells their rect
+    # overlaps, so a query only looks at sprites in nearby cells.
+    def __init__(self, cell_size = 128):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.sprite_cells = {}
+
+    def __len__(self):
+        return len(self.sprite_cells)
+
+    def __contains__(self, sprite):
+        return sprite in self.sprite_cells
+
+    def cell_keys(self, rect):
+        size = self.cell_size
+        left, top = int(rect.left // size), int(rect.top // size)
+        right, bottom = int(rect.right // size), int(rect.bottom // size)
+        return tuple((x, y) for x in range(left, right + 1) for y in range(top, bottom + 1))
+
+    def insert(self, sprite):
+        keys = self.cell_keys(sprite.rect)
+        self.sprite_cells[sprite] = keys
+        for key in keys:
+            self.cells[key].append(sprite)
+
+    def remove(self, sprite):
+        for key in self.sprite_cells.pop(sprite, ()):
+            cell = self.cells[key]
+            cell.remove(sprite)
+            if not cell:
+                del self.cells[key]
+
+    def move(self, sprite):
+        keys = self.cell_keys(sprite.rect)
+        if keys != self.sprite_cells.get(sprite):
+            self.remove(sprite)
+            self.sprite_cells[sprite] = keys
+            for key in keys:
+                self.cells[key].append(sprite)
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+
+    def build(self, sprites):
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def sync(self, sprites):
+        # incremental update: drop sprites that left the group, re-bucket the rest
+        # (in group order, not set order, so cell contents are reproducible)
+        sprites = list(sprites)
+        for sprite in self.sprite_cells.keys() - set(sprites):
+            self.remove(sprite)
+        for sprite in sprites:
+            self.move(sprite)
+
+    def query(self, rect):
+        found = []
+        seen = set()
+        cells = self.cells
+        for key in self.cell_keys(rect):
+            for sprite in cells.get(key, ()):
+                if sprite not in seen:
+                    seen.add(sprite)
+                    if rect.colliderect(sprite.rect):
+                        found.append(sprite)
+        return found
+
+    def pairs(self, sprites):
+        for sprite in sprites:
+            for other in self.query(sprite.rect):
+                yield sprite, other
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+import pygame
+
+from common.atlas import Atlas
+
+# Text rendering without a font.render call per frame. TextCache keeps the
+# surfaces of recently drawn strings (LRU, keyed by font, string, colour and
+# antialiasing); GlyphAtlas pre-renders a small character set once and lays
+# out strings that change every frame, like scores and timers, from it.
+#
+# Every real font.render goes through TextCache.render_font so the per-frame
+# render count covers both. Call end_frame() once per frame.
+
+class TextCache:
+    def __init__(self, max_entries = 256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # font.render calls, in total and per frame
+        self.render_calls = 0
+        self.frame_renders = 0
+        self.last_frame_renders = 0
+        self.peak_frame_renders = 0
+        self.frames = 0
+
+    def render_font(self, font, text, antialias, color, background = None):
+        self.render_calls += 1
+        self.frame_renders += 1
+        return font.render(text, antialias, color, background)
+
+    def render(self, font, text, antialias, color, background = None):
+        # colours are normalised so 'white' and (255, 255, 255) share an entry
+        color = tuple(pygame.Color(color))
+        if background is not None:
+            background = tuple(pygame.Color(background))
+        key = (font, text, color, antialias, background)
+
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = self.entries[key] = self.render_font(font, text, antialias, color, background)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+        return surf
+
+    def end_frame(self):
+        self.last_frame_renders = self.frame_renders
+        self.peak_frame_renders = max(self.peak_frame_renders, self.frame_renders)
+        self.frame_renders = 0
+        self.frames += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def __str__(self):
+        per_frame = self.render_calls / self.frames if self.frames else 0.0
+        return (f'text: {self.render_calls} renders over {self.frames} frames '
+                f'({per_frame:.3f}/frame, peak {self.peak_frame_renders}), '
+                f'{self.hits} hits, {self.misses} misses, {self.evictions} evictions, {len(self.entries)} cached')
+
+class GlyphAtlas:
+    def __init__(self, cache, font, chars = '0123456789', antialias = True, color = 'white'):
+        self.cache = cache
+        self.font = font
+        self.antialias = antialias
+        self.color = color
+
+        surfaces = {char: cache.render_font(font, char, antialias, color) for char in chars}
+        self.atlas = Atlas.from_surfaces(surfaces)
+        self.glyphs = dict(self.atlas.frames)
+        self.height = font.get_height()
+
+    def glyph(self, char):
+        surf = self.glyphs.get(char)
+        if surf is None:
+            # characters outside the atlas are rendered once on first use
+            surf = self.glyphs[char] = self.cache.render_font(self.font, char, self.antialias, self.color)
+        return surf
+
+    def size(self, text):
+        return sum(self.glyph(char).get_width() for char in text), self.height
+
+    def draw(self, surface, text, pos):
+        x, y = pos
+        blits = []
+        for char in text:
+            surf = self.glyph(char)
+            blits.append((surf, (x, y)))
+            x += surf.get_width()
+        surface.fblits(blits)
+        return pygame.FRect(pos, (x - pos[0], self.height))
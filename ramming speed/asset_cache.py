@@ -0,0 +1,85 @@
+import pygame
+import hashlib
+import os
+import struct
+import time
+
+CACHE_VERSION = 2
+# SDL's usual 32-bit display format; surfaces read back in it need no conversion
+PIXEL_FORMAT = 'BGRA'
+HEADER = struct.Struct('<II')
+
+
+def upscale_image(image, scale):
+    width = image.get_width() * scale
+    height = image.get_height() * scale
+    return pygame.transform.scale(image, (width, height))
+
+
+class AssetCache:
+    # Stores already scaled (and flipped) surfaces as raw pixel buffers so warm
+    # starts skip PNG decoding and resampling entirely.
+    def __init__(self, folder='.asset_cache', enabled=True):
+        self.folder = folder
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.load_time = 0.0
+        self.native_masks = None
+        if enabled:
+            os.makedirs(folder, exist_ok=True)
+
+    def cache_path(self, path, scale, flip):
+        # Keyed by the source file's mtime and size plus the processing options
+        stat = os.stat(path)
+        key = f'{CACHE_VERSION}|{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{scale}|{flip}'
+        return os.path.join(self.folder, hashlib.sha1(key.encode()).hexdigest() + '.raw')
+
+    def load(self, path, scale=1, flip=False):
+        start = time.perf_counter()
+        surface = self.read(path, scale, flip) if self.enabled else None
+        if surface is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            surface = self.build(path, scale, flip)
+        self.load_time += time.perf_counter() - start
+        return surface
+
+    def read(self, path, scale, flip):
+        try:
+            with open(self.cache_path(path, scale, flip), 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        # Empty or truncated files are rebuilt instead of crashing startup
+        if len(data) < HEADER.size:
+            return None
+        width, height = HEADER.unpack_from(data)
+        if len(data) != HEADER.size + width * height * 4:
+            return None
+        pixels = memoryview(data)[HEADER.size:]
+        surface = pygame.image.frombuffer(pixels, (width, height), PIXEL_FORMAT)
+        if self.native_masks is None:
+            self.native_masks = pygame.Surface((1, 1)).convert_alpha().get_masks()
+        return surface if surface.get_masks() == self.native_masks else surface.convert_alpha()
+
+    def build(self, path, scale, flip):
+        surface = upscale_image(pygame.image.load(path).convert_alpha(), scale)
+        if flip:
+            surface = pygame.transform.flip(surface, True, False)
+        if self.enabled:
+            self.write(self.cache_path(path, scale, flip), surface)
+        return surface
+
+    def write(self, cache_path, surface):
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(HEADER.pack(*surface.get_size()))
+            file.write(pygame.image.tobytes(surface, PIXEL_FORMAT))
+        os.replace(temp_path, cache_path)
+
+    def report(self):
+        total = self.hits + self.misses
+        return (f'Loaded {total} images in {self.load_time * 1000:.1f} ms '
+                f'({self.hits} cached, {self.misses} decoded)')
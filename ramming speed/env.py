@@ -0,0 +1,258 @@
+import os
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from os.path import abspath, dirname, join
+
+# No window: the dummy video driver still gives convert_alpha a pixel format
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+import pygame
+from asset_cache import AssetCache
+from game import GAME_TIME, SCREEN_HEIGHT, SCREEN_WIDTH, Game, GameAssets
+
+# Headless training API for Zombie Road Rampage.
+#
+# RammingSpeedEnv runs one game without a display, gym style:
+#
+#     env = RammingSpeedEnv(seed=1)
+#     observation = env.reset()
+#     observation, reward, done, info = env.step(action)   # 0 straight, 1 left, 2 right
+#
+# The reward is the score gained and an episode is one 60 second game. The
+# observation is a 'state' vector (car, clock and the nearest zombies), a
+# low resolution 'pixels' image of the road drawn straight into a NumPy
+# array, or None for pure throughput.
+#
+# VectorEnv steps N of them in worker processes. Actions, observations,
+# rewards and dones live in shared memory, so a step only sends one short
+# message to each worker and nothing is pickled per environment. Finished
+# environments reset themselves.
+
+GAME_DIR = dirname(abspath(__file__))
+ASSET_CACHE_DIR = join(GAME_DIR, '.asset_cache')
+ACTIONS = (0, -1, 1)  # straight, left, right
+NEAREST_ZOMBIES = 16
+ZOMBIE_FEATURES = 4
+STATE_SIZE = 4 + NEAREST_ZOMBIES * ZOMBIE_FEATURES
+
+# Assets (and their masks) are loaded once per process and shared by every game
+shared_assets = None
+
+
+def load_assets():
+    global shared_assets
+    if shared_assets is None:
+        if pygame.display.get_surface() is None:
+            pygame.display.init()
+            pygame.display.set_mode((1, 1))
+        shared_assets = GameAssets(AssetCache(ASSET_CACHE_DIR), GAME_DIR)
+    return shared_assets
+
+
+class RammingSpeedEnv:
+    def __init__(self, seed=None, observation='state', frame_skip=1, spawn_rate=1, pixel_scale=8):
+        if observation not in ('state', 'pixels', None):
+            raise ValueError(f'unknown observation type {observation!r}')
+        self.game = Game(load_assets(), seed, spawn_rate)
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.pixel_scale = pixel_scale
+
+        if observation == 'pixels':
+            self.observation_shape = (SCREEN_HEIGHT // pixel_scale, SCREEN_WIDTH // pixel_scale)
+            self.observation_dtype = np.uint8
+        elif observation == 'state':
+            self.observation_shape = (STATE_SIZE,)
+            self.observation_dtype = np.float32
+        else:
+            self.observation_shape = (0,)
+            self.observation_dtype = np.float32
+        self.buffer = np.zeros(self.observation_shape, self.observation_dtype)
+
+        # Road geometry for normalising positions
+        assets = self.game.assets
+        self.road_left = assets.road_x_offset
+        self.road_width = assets.road_width
+
+    def reset(self, seed=None, out=None):
+        self.game.reset(seed)
+        return self.observe(out)
+
+    def step(self, action, out=None):
+        # out: optional array to write the observation into
+        game = self.game
+        steer = ACTIONS[action]
+        score = game.score
+        for _ in range(self.frame_skip):
+            game.step(steer)
+            if game.game_over:
+                break
+        info = {'score': game.score, 'steps': game.steps}
+        return self.observe(out), game.score - score, game.game_over, info
+
+    def observe(self, out=None):
+        if self.observation is None:
+            return None
+        out = self.buffer if out is None else out
+        if self.observation == 'state':
+            self.observe_state(out)
+        else:
+            self.observe_pixels(out)
+        return out
+
+    def observe_state(self, out):
+        # car position, time left, difficulty and zombie count, then the
+        # nearest zombies still ahead of the car's rear bumper as
+        # (dx, dy, vx, fat), nearest first and zero padded
+        game = self.game
+        car = game.car
+        car_center = car.x + car.width / 2
+        car_bottom = car.y + car.height
+        out[0] = (car.x - self.road_left) / self.road_width
+        out[1] = game.time_left / GAME_TIME
+        out[2] = game.difficulty_multiplier
+        out[3] = len(game.zombies) / NEAREST_ZOMBIES
+
+        ahead = [zombie for zombie in game.zombies if zombie.y < car_bottom]
+        ahead.sort(key=lambda zombie: car.y - zombie.y)
+        features = out[4:].reshape(NEAREST_ZOMBIES, ZOMBIE_FEATURES)
+        features[:] = 0
+        for row, zombie in zip(features, ahead):
+            row[0] = (zombie.x + zombie.width / 2 - car_center) / self.road_width
+            row[1] = (car.y - zombie.y) / SCREEN_HEIGHT
+            row[2] = zombie.vx
+            row[3] = zombie.zombie_type == 'zombie2'
+
+    def observe_pixels(self, out):
+        # Tight collision rects at 1/pixel_scale resolution: zombies 255 (fat
+        # ones 170), the car 85, everything else 0
+        scale = self.pixel_scale
+        height, width = out.shape
+        out[:] = 0
+        for zombie in self.game.zombies:
+            bounds = zombie.frame.bounds
+            top, left = int(zombie.y + bounds.top) // scale, int(zombie.x + bounds.left) // scale
+            if top >= height or top + bounds.height // scale < 0:
+                continue
+            shade = 170 if zombie.zombie_type == 'zombie2' else 255
+            out[max(top, 0):top + max(1, bounds.height // scale), max(left, 0):left + max(1, bounds.width // scale)] = shade
+        car = self.game.car
+        bounds = car.frame.bounds
+        top, left = int(car.y + bounds.top) // scale, int(car.x + bounds.left) // scale
+        out[top:top + max(1, bounds.height // scale), left:left + max(1, bounds.width // scale)] = 85
+
+
+def shared_array(shape, dtype, name=None):
+    # NumPy view of a shared memory block, created when name is None
+    if name is None:
+        memory = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+    else:
+        memory = SharedMemory(name=name)
+    return memory, np.ndarray(shape, dtype, buffer=memory.buf)
+
+
+def worker_main(connection, first, seeds, env_kwargs, names, shapes):
+    memories, arrays = zip(*(shared_array(shape, dtype, name) for name, (shape, dtype) in zip(names, shapes)))
+    observations, rewards, dones, actions = arrays
+    envs = [RammingSpeedEnv(seed, **env_kwargs) for seed in seeds]
+    has_observations = envs[0].observation is not None
+    try:
+        while True:
+            command = connection.recv()
+            if command == 'close':
+                break
+            finished = []
+            for index, env in enumerate(envs, first):
+                out = observations[index] if has_observations else None
+                if command == 'reset':
+                    env.reset(out=out)
+                    continue
+                _, reward, done, info = env.step(int(actions[index]), out)
+                rewards[index] = reward
+                dones[index] = done
+                if done:
+                    finished.append((index, info['score']))
+                    env.reset(out=out)
+            connection.send(finished)
+    finally:
+        for memory in memories:
+            memory.close()
+
+
+class VectorEnv:
+    def __init__(self, num_envs, workers=None, seed=0, **env_kwargs):
+        self.num_envs = num_envs
+        probe = RammingSpeedEnv(**env_kwargs)
+        self.observation_shape = (num_envs, *probe.observation_shape)
+        shapes = (
+            (self.observation_shape, probe.observation_dtype),
+            ((num_envs,), np.float32),
+            ((num_envs,), np.bool_),
+            ((num_envs,), np.int8)
+        )
+        self.memories, arrays = zip(*(shared_array(shape, dtype) for shape, dtype in shapes))
+        self.observations, self.rewards, self.dones, self.actions = arrays
+        names = [memory.name for memory in self.memories]
+
+        # Environments are split into one contiguous slice per worker
+        workers = min(workers or os.cpu_count(), num_envs)
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+        self.connections = []
+        self.processes = []
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            parent, child = multiprocessing.Pipe()
+            seeds = [seed + index for index in range(first, last)]
+            process = multiprocessing.Process(
+                target=worker_main, args=(child, int(first), seeds, env_kwargs, names, shapes), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+        # Stats
+        self.steps = 0
+        self.episodes = 0
+        self.episode_scores = []
+
+    def send(self, command):
+        for connection in self.connections:
+            connection.send(command)
+        finished = []
+        for connection in self.connections:
+            finished.extend(connection.recv())
+        return finished
+
+    def reset(self):
+        self.send('reset')
+        return self.observations
+
+    def step(self, actions):
+        # Returns views of the shared buffers (overwritten by the next step)
+        # and the (env index, final score) of episodes that ended this step
+        self.actions[:] = actions
+        finished = self.send('step')
+        self.steps += self.num_envs
+        self.episodes += len(finished)
+        self.episode_scores.extend(score for _, score in finished)
+        return self.observations, self.rewards, self.dones, finished
+
+    def close(self):
+        if not self.processes:
+            return
+        for connection in self.connections:
+            connection.send('close')
+        for process in self.processes:
+            process.join()
+        for memory in self.memories:
+            memory.close()
+            memory.unlink()
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
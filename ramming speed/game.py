@@ -0,0 +1,322 @@
+import pygame
+import random
+import sys
+from os.path import abspath, dirname, join
+
+sys.path.append(join(dirname(abspath(__file__)), '..'))
+from common.animation import Animation, AnimationFrame
+from common.atlas import Atlas
+from common.pool import Pool
+from zombies import ZombieStore
+
+# Game logic of Zombie Road Rampage, without any drawing or input handling.
+# main.py plays it in a window, env.py steps it headless for bots. Everything
+# counts in 60 Hz simulation steps and all randomness comes from the game's
+# own random.Random, so a seed and the steering inputs reproduce a run.
+
+SCREEN_WIDTH = 590
+SCREEN_HEIGHT = 800
+PIXEL_SCALE = 3
+STEPS_PER_SECOND = 60
+GAME_TIME = 60
+ROAD_SPEED = 7
+SPAWN_DELAY = 40
+
+
+class GameAssets:
+    # Upscaled images with their collision data, loaded once and shared by
+    # every game in the process
+    def __init__(self, cache, folder=''):
+        def load(name, flip=False):
+            return cache.load(join(folder, 'images', name), PIXEL_SCALE, flip=flip)
+
+        # Car images
+        self.car_frames = {
+            'straight': AnimationFrame(load('car.png')),
+            'left': AnimationFrame(load('car_left.png')),
+            'right': AnimationFrame(load('car_right.png'))
+        }
+
+        # Road image
+        self.road_img = load('road.png')
+        self.road_width = self.road_img.get_width()
+        self.road_height = self.road_img.get_height()
+        # Center road on screen
+        self.road_x_offset = (SCREEN_WIDTH - self.road_width) // 2 if self.road_width < SCREEN_WIDTH else 0
+
+        # Load zombie images and pack them, with the mirrored right-facing
+        # frames, into a single atlas texture
+        zombie_images = {}
+        for zombie_type in ('zombie1', 'zombie2'):
+            for i in range(1, 10):
+                zombie_images[f'{zombie_type}/{i}'] = load(f'{zombie_type}/{i}.png')
+                if 4 <= i <= 6:  # Left facing, create right facing by flipping
+                    zombie_images[f'{zombie_type}/{i}_right'] = load(f'{zombie_type}/{i}.png', flip=True)
+        self.zombie_atlas = Atlas.from_surfaces(zombie_images)
+
+        # zombie1 is the normal zombie, zombie2 the fat one
+        self.zombie_frames = {zombie_type: self.animations(zombie_type) for zombie_type in ('zombie1', 'zombie2')}
+
+    # Each animation also holds every frame's mask and tight rect for collisions
+    def animations(self, zombie_type):
+        return {
+            'front': Animation(self.zombie_atlas.sequence(f'{zombie_type}/{i}' for i in (1, 2, 3))),
+            'left': Animation(self.zombie_atlas.sequence(f'{zombie_type}/{i}' for i in (4, 5, 6))),
+            'right': Animation(self.zombie_atlas.sequence(f'{zombie_type}/{i}_right' for i in (4, 5, 6))),
+            'back': Animation(self.zombie_atlas.sequence(f'{zombie_type}/{i}' for i in (7, 8, 9)))
+        }
+
+
+# Player car class
+class Car:
+    def __init__(self, assets):
+        self.frames = assets.car_frames
+        self.frame = self.frames['straight']
+        self.image = self.frame.surface
+        self.width = self.image.get_width()
+        self.height = self.image.get_height()
+        self.speed = 5
+
+        # Calculate road boundaries
+        self.left_bound = assets.road_x_offset + 20
+        self.right_bound = assets.road_x_offset + assets.road_width - self.width - 20
+        self.reset()
+
+    def reset(self):
+        self.x = SCREEN_WIDTH // 2 - self.width // 2
+        self.y = SCREEN_HEIGHT - self.height - 100
+        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.set_direction("straight")
+
+    def set_direction(self, direction):
+        self.direction = direction
+        self.frame = self.frames[direction]
+        self.image = self.frame.surface
+
+    def move_left(self):
+        if self.x > self.left_bound:
+            self.x -= self.speed
+            self.rect.x = self.x
+            self.set_direction("left")
+
+    def move_right(self):
+        if self.x < self.right_bound:
+            self.x += self.speed
+            self.rect.x = self.x
+            self.set_direction("right")
+
+    def update(self):
+        # Reset to straight
+        if self.direction != "straight":
+            self.set_direction("straight")
+
+    def draw(self, surface):
+        surface.blit(self.image, (self.x, self.y))
+
+
+# Zombie class
+class Zombie:
+    __slots__ = ('zombie_type', 'frames_dict', 'points', 'base_speed', 'current_frame', 'animation_speed',
+                 'animation_timer', 'direction', 'width', 'height', 'x', 'y', 'vx', 'speed', 'rect', 'pool',
+                 'left_bound', 'right_bound')
+
+    def __init__(self, game, zombie_type='zombie1', x_offset=0, y_offset=0):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(game, zombie_type, x_offset, y_offset)
+
+    # Pooled zombies are re-initialised here instead of being constructed again
+    def reset(self, game, zombie_type='zombie1', x_offset=0, y_offset=0):
+        assets, rng = game.assets, game.rng
+
+        # Determine zombie type
+        self.zombie_type = zombie_type
+        self.frames_dict = assets.zombie_frames[zombie_type]
+        if zombie_type == 'zombie1':
+            self.points = 10
+            self.base_speed = rng.uniform(2, 5)
+        else:  # zombie2 (fat zombie)
+            self.points = 15  # More points for fat zombies
+            self.base_speed = rng.uniform(1, 3)  # Slower
+
+        # Animation setup
+        self.current_frame = 0
+        self.animation_speed = rng.uniform(0.1, 0.3)
+        self.animation_timer = 0
+
+        # Position and movement
+        self.direction = 'front'  # Start facing front
+        self.width = self.frames_dict['front'][0].surface.get_width()
+        self.height = self.frames_dict['front'][0].surface.get_height()
+
+        # Road boundaries
+        self.left_bound = assets.road_x_offset + 20
+        self.right_bound = assets.road_x_offset + assets.road_width - self.width - 20
+        self.x = rng.randint(self.left_bound, self.right_bound) + x_offset
+        self.y = -self.height - 50 + y_offset
+
+        # Movement direction (for animations)
+        self.vx = rng.uniform(-1, 1)  # Slight horizontal movement
+        self.speed = self.base_speed + ROAD_SPEED
+
+        self.rect.update(self.x, self.y, self.width, self.height)
+
+    def move(self):
+        # Move zombie
+        self.y += self.speed
+        self.x += self.vx
+
+        # Keep within road boundaries
+        if self.x < self.left_bound or self.x > self.right_bound:
+            self.vx = -self.vx
+            self.x = max(self.left_bound, min(self.x, self.right_bound))
+
+        self.rect.x = self.x
+        self.rect.y = self.y
+
+        # Update direction based on movement
+        if abs(self.vx) < 0.3:
+            if self.speed > ROAD_SPEED:
+                self.direction = 'front'
+            else:
+                self.direction = 'back'
+        elif self.vx < -0.3:
+            self.direction = 'left'
+        else:
+            self.direction = 'right'
+
+        # Animate
+        self.animation_timer += self.animation_speed
+        if self.animation_timer >= 1:
+            self.animation_timer = 0
+            self.current_frame = (self.current_frame + 1) % 3
+
+    @property
+    def frame(self):
+        return self.frames_dict[self.direction][self.current_frame]
+
+    @property
+    def image(self):
+        return self.frames_dict[self.direction][self.current_frame].surface
+
+    def draw(self, surface):
+        surface.blit(self.image, (self.x, self.y))
+
+
+class Game:
+    def __init__(self, assets, seed=None, spawn_rate=1):
+        self.assets = assets
+        self.spawn_rate = spawn_rate
+        self.rng = random.Random(seed)
+        self.car = Car(assets)
+        self.zombie_pool = Pool(Zombie)
+        self.zombies = ZombieStore(self.zombie_pool, SCREEN_HEIGHT)
+
+        # Spawn pattern list
+        self.spawn_patterns = [
+            self.spawn_single_zombie,
+            self.spawn_horizontal_line,
+            self.spawn_v_formation,
+            self.spawn_cluster
+        ]
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.car.reset()
+        self.zombies.clear()
+        self.score = 0
+        self.time_left = GAME_TIME
+        self.game_over = False
+        self.spawn_timer = 0
+        self.spawn_delay = SPAWN_DELAY
+        self.second_timer = 0
+        self.difficulty_multiplier = 1.0
+        self.steps = 0
+
+    # Zombie spawn patterns
+    def spawn_single_zombie(self):
+        # 70% chance for normal zombie, 30% for fat zombie
+        zombie_type = 'zombie1' if self.rng.random() < 0.7 else 'zombie2'
+        return [self.zombie_pool.acquire(self, zombie_type=zombie_type)]
+
+    def spawn_horizontal_line(self, count=3):
+        zombies = []
+        spacing = (self.assets.road_width - 40) // (count + 1)
+        # Mixed zombie types
+        for i in range(count):
+            x_offset = (i - count // 2) * spacing
+            zombie_type = 'zombie1' if self.rng.random() < 0.8 else 'zombie2'
+            zombies.append(self.zombie_pool.acquire(self, zombie_type=zombie_type, x_offset=x_offset))
+        return zombies
+
+    def spawn_v_formation(self):
+        zombies = []
+        # Create V shape with mostly normal zombies
+        for i in range(5):
+            x_offset = (i - 2) * 40
+            y_offset = abs(i - 2) * 30
+            zombie_type = 'zombie1' if i != 2 else 'zombie2'  # Fat zombie in center
+            zombies.append(self.zombie_pool.acquire(self, zombie_type=zombie_type, x_offset=x_offset, y_offset=y_offset))
+        return zombies
+
+    def spawn_cluster(self):
+        zombies = []
+        # Random cluster of zombies
+        count = self.rng.randint(4, 7)
+        has_fat_zombie = False
+        for _ in range(count):
+            x_offset = self.rng.randint(-60, 60)
+            y_offset = self.rng.randint(-40, 40)
+            # Ensure at least one fat zombie in cluster
+            if not has_fat_zombie and _ == count - 1:
+                zombie_type = 'zombie2'
+            else:
+                zombie_type = 'zombie1' if self.rng.random() < 0.7 else 'zombie2'
+                if zombie_type == 'zombie2':
+                    has_fat_zombie = True
+            zombies.append(self.zombie_pool.acquire(self, zombie_type=zombie_type, x_offset=x_offset, y_offset=y_offset))
+        return zombies
+
+    def step(self, steer=0):
+        # One 60 Hz step; steer is -1 (left), 0 or 1 (right). Returns the
+        # zombies the car hit. They are already back in the pool, so read
+        # them before the next step.
+        if self.game_over:
+            return []
+        self.steps += 1
+
+        # Count down
+        self.second_timer += 1
+        if self.second_timer >= STEPS_PER_SECOND:
+            self.second_timer = 0
+            self.time_left -= 1
+            # Increase difficulty
+            if self.time_left % 10 == 0 and self.spawn_delay > 15:
+                self.spawn_delay -= 5
+                self.difficulty_multiplier += 0.2
+            if self.time_left <= 0:
+                self.game_over = True
+                return []
+
+        # Update player car
+        self.car.update()
+
+        # Move player
+        if steer < 0:
+            self.car.move_left()
+        elif steer > 0:
+            self.car.move_right()
+
+        # Spawn zombies
+        self.spawn_timer += self.spawn_rate
+        while self.spawn_timer > self.spawn_delay:
+            pattern = self.rng.choice(self.spawn_patterns)
+            self.zombies.extend(pattern())
+            self.spawn_timer -= self.spawn_delay + 1
+
+        # Move zombies, drop off-screen ones and collect the ones the car hit
+        hits = self.zombies.update(self.car)
+        for zombie in hits:
+            self.score += int(zombie.points * self.difficulty_multiplier)
+        return hits
@@ -0,0 +1,80 @@
+import pygame
+import numpy as np
+
+
+class BloodParticles:
+    # All particles live in flat NumPy arrays (struct of arrays) so a whole burst
+    # is integrated, culled and drawn in a handful of batched calls.
+    def __init__(self, colors, pixel_scale, bottom, max_particles=4000, gravity=0.5, friction=0.96, seed=None):
+        self.max_particles = max_particles
+        self.gravity = gravity
+        self.friction = friction
+        self.bottom = bottom
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(max_particles, np.float32)
+        self.y = np.zeros(max_particles, np.float32)
+        self.vx = np.zeros(max_particles, np.float32)
+        self.vy = np.zeros(max_particles, np.float32)
+        self.lifetime = np.zeros(max_particles, np.int16)
+        self.style = np.zeros(max_particles, np.uint8)
+        self.count = 0
+        self.dropped = 0
+
+        # One small square surface per (size, color) pair, indexed by style
+        self.sizes = [size * pixel_scale // 2 for size in (1, 2, 3)]
+        self.colors = colors
+        self.surfaces = []
+        for size in self.sizes:
+            for color in colors:
+                surf = pygame.Surface((size, size))
+                surf.fill(color)
+                self.surfaces.append(surf)
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, x, y, amount):
+        amount_kept = min(amount, self.max_particles - self.count)
+        self.dropped += amount - amount_kept
+        if amount_kept <= 0:
+            return
+
+        new = slice(self.count, self.count + amount_kept)
+        angle = self.rng.uniform(0, 2 * np.pi, amount_kept)
+        speed = self.rng.uniform(3, 10, amount_kept)
+        self.x[new] = x
+        self.y[new] = y
+        self.vx[new] = np.cos(angle) * speed
+        self.vy[new] = np.sin(angle) * speed
+        self.lifetime[new] = self.rng.integers(15, 31, amount_kept)
+        size = self.rng.integers(0, len(self.sizes), amount_kept)
+        color = self.rng.integers(0, len(self.colors), amount_kept)
+        self.style[new] = size * len(self.colors) + color
+        self.count += amount_kept
+
+    def update(self):
+        live = slice(0, self.count)
+        self.x[live] += self.vx[live]
+        self.y[live] += self.vy[live]
+        self.vy[live] += self.gravity
+        self.lifetime[live] -= 1
+        self.vx[live] *= self.friction
+
+        # Compact the survivors to the front of every array in one pass
+        keep = (self.lifetime[live] > 0) & (self.y[live] <= self.bottom)
+        kept = int(np.count_nonzero(keep))
+        if kept != self.count:
+            for array in (self.x, self.y, self.vx, self.vy, self.lifetime, self.style):
+                array[:kept] = array[live][keep]
+            self.count = kept
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        positions = zip(self.x[:self.count].astype(np.int32).tolist(), self.y[:self.count].astype(np.int32).tolist())
+        surfaces = map(self.surfaces.__getitem__, self.style[:self.count].tolist())
+        surface.fblits(zip(surfaces, positions))
+
+    def clear(self):
+        self.count = 0
@@ -0,0 +1,64 @@
+from common.animation import collide
+
+
+class ZombieStore:
+    # Live zombies in one list that is compacted in place while they move:
+    # off-screen and run-over zombies are dropped (and handed back to their
+    # pool) in the same pass, so there is no list copy and no O(n) remove.
+    # Only zombies overlapping the car's rows are tested against it, tight
+    # rects first and then the precomputed frame masks.
+    def __init__(self, pool, bottom):
+        self.pool = pool
+        self.bottom = bottom
+        self.zombies = []
+
+        # Stats
+        self.moved = 0
+        self.collision_tests = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.zombies)
+
+    def __iter__(self):
+        return iter(self.zombies)
+
+    def extend(self, zombies):
+        self.zombies.extend(zombies)
+
+    def update(self, car):
+        # Returns the zombies the car hit this step. They are already back in
+        # the pool, so read them before the next spawn.
+        zombies = self.zombies
+        release = self.pool.release
+        bottom = self.bottom
+        band_top, band_bottom = car.rect.top, car.rect.bottom
+        car_frame, car_pos = car.frame, (car.x, car.y)
+        hits = []
+        write = 0
+        for zombie in zombies:
+            zombie.move()
+            y = zombie.y
+            if y > bottom:
+                release(zombie)
+                continue
+            if y < band_bottom and y + zombie.height > band_top:
+                self.collision_tests += 1
+                if collide(car_frame, car_pos, zombie.frame, (zombie.x, zombie.y)):
+                    self.hits += 1
+                    hits.append(zombie)
+                    release(zombie)
+                    continue
+            zombies[write] = zombie
+            write += 1
+        self.moved += len(zombies)
+        del zombies[write:]
+        return hits
+
+    def clear(self):
+        for zombie in self.zombies:
+            self.pool.release(zombie)
+        self.zombies.clear()
+
+    def __str__(self):
+        return f'zombies: {self.moved} moves, {self.collision_tests} collision tests, {self.hits} hits'
@@ -1,5 +1,25 @@
+import logging
 import pygame
 import random
+import sys
+from os.path import abspath, dirname, join
+from rotation_cache import RotationCache
+
+sys.path.append(join(dirname(abspath(__file__)), '..'))
+from common.atlas import load_atlas
+from common.audio import AudioManager
+from common.dirty import DirtyRenderer
+from common.gameloop import FixedTimestep, InterpolatedGroup
+from common.pool import GCMonitor, Pool, PooledSprite, shared_mask
+from common.profiler import profiler
+from common.replay import replay_session, state_hash
+from common.scheduler import scheduler
+from common.spatial_hash import SpatialHash
+from common.text import GlyphAtlas, TextCache
+
+# --debug logs the cache, pool, gc, renderer and audio stats on exit
+if '--debug' in sys.argv:
+    logging.basicConfig(level=logging.DEBUG)
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, groups):
@@ -11,85 +31,96 @@ class Player(pygame.sprite.Sprite):
 
         # cooldown
         self.can_shoot = True
-        self.laser_shoot_time = 0
         self.cooldown_duration = 100
 
         # mask
         self.mask = pygame.mask.from_surface(self.image)
 
-    def laser_timer(self):
-        if not self.can_shoot:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.laser_shoot_time >= self.cooldown_duration:
-                self.can_shoot = True
+    def enable_shooting(self):
+        self.can_shoot = True
 
     def update(self, delta_time):
-        keys = pygame.key.get_pressed()
+        # keys are read once per simulation step, from the replay when playing one back
         self.direction.x = int(keys[pygame.K_RIGHT]) - int(keys[pygame.K_LEFT])
         self.direction.y = int(keys[pygame.K_DOWN]) - int(keys[pygame.K_UP])
         self.direction = self.direction.normalize() if self.direction else self.direction
         self.rect.center += self.direction * self.speed * delta_time
 
-        self.laser_timer()
-        key_pressed = pygame.key.get_just_pressed()
         if keys[pygame.K_SPACE] and self.can_shoot:
-            Laser(laser_surf, self.rect.midtop, (all_sprites, laser_sprites))
+            laser_pool.acquire(laser_surf, self.rect.midtop, (all_sprites, laser_sprites))
             self.can_shoot = False
-            self.laser_shoot_time = pygame.time.get_ticks()
-            laser_sound.play()
+            scheduler.schedule(self.cooldown_duration, self.enable_shooting)
+            audio.play('laser')
 
-class Star(pygame.sprite.Sprite):
-    def __init__(self, surf, groups):
-        super().__init__(groups)
-        self.image = surf
-        self.rect = self.image.get_frect(center=(random.randint(0, WINDOW_WIDTH), random.randint(0, WINDOW_HEIGHT)))
+def bake_starfield(surf, count):
+    # the stars never move, so they are part of the background instead of sprites
+    background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    background.fill('black')
+    for _ in range(count):
+        background.blit(surf, surf.get_frect(center=(random.randint(0, WINDOW_WIDTH), random.randint(0, WINDOW_HEIGHT))))
+    return background
 
-class Laser(pygame.sprite.Sprite):
+class Laser(PooledSprite):
     def __init__(self, surf, pos, groups):
-        super().__init__(groups)
+        super().__init__()
+        self.reset(surf, pos, groups)
+
+    def reset(self, surf, pos, groups):
         self.image = surf
         self.rect = self.image.get_frect(midbottom=pos)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = shared_mask(surf)
+        self.add(groups)
 
     def update(self, delta_time):
         self.rect.centery -= 1000 * delta_time
         if self.rect.bottom < 0:
             self.kill()
 
-class Meteor(pygame.sprite.Sprite):
-    def __init__(self, surf, groups):
-        super().__init__(groups)
-        self.original_surf = surf
-        self.image = surf
+class Meteor(PooledSprite):
+    def __init__(self, rotations, groups):
+        super().__init__()
+        self.direction = pygame.math.Vector2()
+        self.reset(rotations, groups)
+
+    def reset(self, rotations, groups):
+        self.rotations = rotations
+        self.image, self.mask = rotations.get(0)
         self.rect = self.image.get_frect(center=(random.randint(100, WINDOW_WIDTH - 100), -200))
-        self.born = pygame.time.get_ticks()
         self.span = 2000
-        self.direction = pygame.math.Vector2()
-        self.direction.x = random.randint(-50, 50)
-        self.direction.y = random.randint(100, 200)
-        self.direction = self.direction.normalize()
+        self.expiry = scheduler.schedule(self.span, self.kill)
+        self.direction.update(random.randint(-50, 50), random.randint(100, 200))
+        self.direction.normalize_ip()
         self.speed = 500
-        self.mask = pygame.mask.from_surface(self.image)
         self.rotation = 0
         self.rotation_speed = random.randint(-100, 100)
+        self.add(groups)
 
     def update(self, delta_time):
         self.rect.center += self.direction * self.speed * delta_time
         self.rotation += self.rotation_speed * delta_time
-        self.image = pygame.transform.rotozoom(self.original_surf, self.rotation, 1)
-        self.rect = self.image.get_frect(center=self.rect.center)
-        current_time = pygame.time.get_ticks()
-        if current_time - self.born >= self.span:
-            self.kill()
+        with profiler.span('meteor rotation'):
+            self.image, self.mask = self.rotations.get(self.rotation)
+        center = self.rect.center
+        self.rect.size = self.image.get_size()
+        self.rect.center = center
+
+    def kill(self):
+        # a meteor shot down early must not expire later as a reused one
+        self.expiry.cancel()
+        super().kill()
 
-class AnimatedExplosion(pygame.sprite.Sprite):
+class AnimatedExplosion(PooledSprite):
     def __init__(self, frames, pos, groups):
-        super().__init__(groups)
+        super().__init__()
+        self.reset(frames, pos, groups)
+
+    def reset(self, frames, pos, groups):
         self.image = frames[0]
         self.rect = self.image.get_frect(center=pos)
         self.frame = 1
         self.frames = frames
-        explosion_sound.play()
+        self.add(groups)
+        audio.play('explosion')
 
     def update(self, delta_time):
         self.frame += 50 * delta_time
@@ -100,80 +131,139 @@ class AnimatedExplosion(pygame.sprite.Sprite):
 def collisions():
     global running
 
-    collision_sprites = pygame.sprite.spritecollide(player, meteor_sprites, True, pygame.sprite.collide_mask)
-    if collision_sprites:
-        running = False
+    meteor_hash.sync(meteor_sprites)
 
-    for laser in laser_sprites:
-        collided_sprites = pygame.sprite.spritecollide(laser, meteor_sprites, True)
-        if collided_sprites:
-            laser.kill()
-            AnimatedExplosion(explosion_frames, laser.rect.midtop, all_sprites)
+    for meteor in meteor_hash.query(player.rect):
+        if pygame.sprite.collide_mask(player, meteor):
+            meteor.kill()
+            running = False
+
+    for laser, meteor in meteor_hash.pairs(laser_sprites):
+        if meteor.alive() and pygame.sprite.collide_mask(laser, meteor):
+            meteor.kill()
+            if laser.alive():
+                laser.kill()
+                explosion_pool.acquire(explosion_frames, laser.rect.midtop, all_sprites)
 
 def display_score():
-    current_time = pygame.time.get_ticks()
-    text_surf = font.render(str(current_time // 100), True, 'white')
-    text_rect = text_surf.get_frect(midtop=(WINDOW_WIDTH / 2, 50))
-    display_surface.blit(text_surf, text_rect)
-    pygame.draw.rect(display_surface, 'white', text_rect.inflate(30, 15).move(0, -8), 10, 5)
+    # simulated time, so a replay shows the same score
+    text = str(round(loop.time * 1000) // 100)
+    text_rect = pygame.FRect((0, 0), score_glyphs.size(text))
+    text_rect.midtop = (WINDOW_WIDTH / 2, 50)
+    score_glyphs.draw(display_surface, text, text_rect.topleft)
+    return pygame.draw.rect(display_surface, 'white', text_rect.inflate(30, 15).move(0, -8), 10, 5)
 
 # general setup
 pygame.init()
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280, 720
+ROTATION_STEPS = 360
+ROTATION_CACHE_BYTES = 32 * 1024 * 1024
+COLLISION_CELL_SIZE = 128
+AUDIO_CHANNELS = 12
+DIRTY_RECTS = True # F2 switches between dirty rects and full redraws
+SIMULATION_STEP = 1 / 120
+MAX_CATCH_UP_STEPS = 8
 display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 pygame.display.set_caption('Space Shooter')
 running = True
 clock = pygame.time.Clock()
 
+# --record FILE / --replay FILE; seeds random, so it comes before anything random
+session = replay_session((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE))
+keys = None
+
 # imports
 star_surf = pygame.image.load('images/star.png').convert_alpha()
 meteor_surf = pygame.image.load('images/meteor.png').convert_alpha()
+meteor_rotations = RotationCache(meteor_surf, ROTATION_STEPS, ROTATION_CACHE_BYTES)
 laser_surf = pygame.image.load('images/laser.png').convert_alpha()
 font = pygame.font.Font('images/Oxanium-Bold.ttf', 50)
-explosion_frames = [pygame.image.load(f'images/explosion/{i}.png').convert_alpha() for i in range(21)]
+# digits are rendered once, the score is laid out from them every frame
+text_cache = TextCache()
+score_glyphs = GlyphAtlas(text_cache, font)
+explosion_atlas = load_atlas(join('images', 'explosion'))
+explosion_frames = explosion_atlas.sequence(str(i) for i in range(21))
 
-laser_sound = pygame.mixer.Sound('audio/laser.wav')
-laser_sound.set_volume(0.1)
-explosion_sound = pygame.mixer.Sound('audio/explosion.wav')
-explosion_sound.set_volume(0.1)
-game_music = pygame.mixer.Sound('audio/game_music.wav')
-game_music.set_volume(0.1)
-game_music.play(loops=-1) # play indefinitely
+# sound effects are capped and dispatched once per frame, explosions win over lasers
+audio = AudioManager(AUDIO_CHANNELS)
+audio.load('laser', 'audio/laser.wav', max_voices=3, volume=0.1)
+audio.load('explosion', 'audio/explosion.wav', max_voices=6, priority=1, volume=0.1)
+audio.play_music('audio/game_music.wav', volume=0.1) # streamed, play indefinitely
 
 # sprites
-all_sprites = pygame.sprite.Group()
+all_sprites = InterpolatedGroup()
 meteor_sprites = pygame.sprite.Group()
 laser_sprites = pygame.sprite.Group()
-for _ in range(20):
-    Star(star_surf, all_sprites)
+meteor_hash = SpatialHash(COLLISION_CELL_SIZE)
+laser_pool = Pool(Laser)
+meteor_pool = Pool(Meteor)
+explosion_pool = Pool(AnimatedExplosion)
 player = Player(all_sprites)
 
-# custom events
-meteor_event = pygame.event.custom_type()
-pygame.time.set_timer(meteor_event, 100)
+# allocation and gc stats, logged on exit
+gc_monitor = GCMonitor()
+
+# timers run on game time, advanced by every simulation step
+def spawn_meteor():
+    meteor_pool.acquire(meteor_rotations, (all_sprites, meteor_sprites))
+
+scheduler.schedule(100, spawn_meteor, repeat=True)
+
+# only the background under moving sprites is restored and pushed
+renderer = DirtyRenderer(display_surface, bake_starfield(star_surf, 20), DIRTY_RECTS)
+
+# fixed-step simulation, as fast as possible when playing a replay back
+loop = FixedTimestep(SIMULATION_STEP, MAX_CATCH_UP_STEPS, unlocked=session.playing)
 
 while running:
-    # delta time
-    dt = clock.tick() / 1000
     # event loop
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == meteor_event:
-            Meteor(meteor_surf, (all_sprites, meteor_sprites))
+    with profiler.span('events'):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                renderer.toggle()
+            profiler.handle_event(event)
+
+    # update in fixed steps, however long the frame took
+    for _ in loop.tick(clock):
+        keys = session.step(pygame.key.get_pressed())
+        with profiler.span('update'):
+            scheduler.update(loop.step * 1000)
+            all_sprites.snapshot()
+            all_sprites.update(loop.step)
+        with profiler.span('collisions'):
+            collisions()
+        # no steps after the game ended, so a replay stops on the same one
+        running = running and not session.finished
+        if not running:
+            break
 
-    # update
-    all_sprites.update(dt)
-    collisions()
+    audio.update()
 
-    # draw the game
-    display_surface.fill('black')
-    all_sprites.draw(display_surface)
-    display_score()
+    # draw the game between the last two steps
+    with profiler.span('draw'):
+        renderer.clear()
+        renderer.draw(all_sprites, loop.alpha)
+        renderer.mark(display_score())
+        renderer.mark(profiler.draw(display_surface))
+        text_cache.end_frame()
 
     # draw test
 
 
-    pygame.display.update()
+    with profiler.span('display'):
+        renderer.update()
+    profiler.end_frame()
 
-pygame.quit()
\ No newline at end of file
+pygame.quit()
+logging.debug(meteor_rotations)
+for pool in (laser_pool, meteor_pool, explosion_pool):
+    logging.debug(pool)
+logging.debug(gc_monitor)
+logging.debug(text_cache)
+logging.debug(renderer)
+logging.debug(audio)
+if not session.finish(state_hash(session.steps, tuple(player.rect.center),
+                                 [tuple(meteor.rect.center) for meteor in meteor_sprites], len(laser_sprites))):
+    sys.exit(1)
\ No newline at end of file
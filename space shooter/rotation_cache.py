@@ -0,0 +1,56 @@
+import pygame
+from collections import OrderedDict
+
+class RotationCache:
+    def __init__(self, surf, steps = 360, max_bytes = 32 * 1024 * 1024):
+        self.surf = surf
+        self.steps = steps
+        self.step_angle = 360 / steps
+        self.max_bytes = max_bytes
+
+        # angle index -> (surface, mask), least recently used first
+        self.frames = OrderedDict()
+        self.bytes = 0
+
+        # stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def index(self, angle):
+        return round(angle / self.step_angle) % self.steps
+
+    def get(self, angle):
+        index = self.index(angle)
+        frame = self.frames.get(index)
+        if frame:
+            self.hits += 1
+            self.frames.move_to_end(index)
+            return frame
+
+        self.misses += 1
+        image = pygame.transform.rotozoom(self.surf, index * self.step_angle, 1)
+        frame = (image, pygame.mask.from_surface(image))
+        self.frames[index] = frame
+        self.bytes += self.frame_size(image)
+        while self.bytes > self.max_bytes and len(self.frames) > 1:
+            _, (old_image, _) = self.frames.popitem(last = False)
+            self.bytes -= self.frame_size(old_image)
+            self.evictions += 1
+        return frame
+
+    @staticmethod
+    def frame_size(image):
+        # pixels plus one bit per pixel for the mask
+        width, height = image.get_size()
+        return width * height * image.get_bytesize() + width * height // 8
+
+    def clear(self):
+        self.frames.clear()
+        self.bytes = 0
+
+    def __str__(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0
+        return (f'rotation cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1%} hit rate), '
+                f'{self.evictions} evictions, {len(self.frames)}/{self.steps} frames, {self.bytes / 1024:.0f} KiB')